@@ -26,7 +26,14 @@ SOFTWARE.
 Eww, Notification System - A modern notification daemon for Eww widgets.
 """
 
-__version__ = '1.0.0'
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    # Single source of truth is the version in pyproject.toml
+    __version__ = version('eww-notifier')
+except PackageNotFoundError:
+    # Running from a source checkout that was never installed
+    __version__ = '0.0.0'
 
 from .notification_queue.notification_queue import NotificationQueue
 from .notifier.notification_handler import NotificationHandler
@@ -3,11 +3,10 @@ Main entry point for the notification system.
 """
 
 import logging
-import signal
-import sys
+import os
 
 import eww_notifier.config as config
-from eww_notifier.config import NOTIFICATION_PERMISSION_TEST
+from eww_notifier.config import TMP_DIR, SPOTIFY_CACHE_DIR
 from eww_notifier.factories import (
     get_logger,
     get_handle_error,
@@ -22,42 +21,34 @@ from eww_notifier.utils.error_handler import handle_error, PermissionError
 from eww_notifier.utils.file_utils import create_directories
 from eww_notifier.utils.logging_config import setup_logging
 
-# Set up logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 def check_permissions():
     """Check if we have write permissions to require directories."""
     try:
-        # Test write permission to /tmp
-        test_file = NOTIFICATION_PERMISSION_TEST
-        test_file.touch()
-        test_file.unlink()
+        # os.access asks the kernel directly instead of creating and deleting
+        # a probe file; ACLs can make it optimistic, but these directories
+        # are ours or /tmp
+        for directory in (TMP_DIR, SPOTIFY_CACHE_DIR):
+            if not os.access(directory, os.W_OK):
+                raise PermissionError(f"No write permission for {directory}")
         return True
     except (PermissionError, OSError) as e:
         handle_error(e, "permission check", exit_on_error=True)
         return False
 
 
-def handle_signal(signum, _frame):
-    """Handle system signals for graceful shutdown."""
-    logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    sys.exit(0)
-
-
 def main():
     """Main entry point for the notification system."""
+    # Configure logging only when the daemon actually runs, not on import
+    setup_logging()
     try:
         create_directories()
         # Check permissions first
         if not check_permissions():
             raise PermissionError("Failed permission check")
 
-        # Set up signal handlers
-        signal.signal(signal.SIGINT, handle_signal)
-        signal.signal(signal.SIGTERM, handle_signal)
-
         # Manual DI wiring
         logger = get_logger()
         handle_error = get_handle_error()
@@ -2,19 +2,12 @@
 Configuration constants and directory setup for the notification system.
 """
 
-import logging
 import os
 from pathlib import Path
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 # Base directories
 HOME = Path(os.path.expanduser("~"))
 TMP_DIR = Path('/tmp')
@@ -81,11 +74,17 @@ DEFAULT_ICON = USR_SHARE / "icons/Adwaita/symbolic/status/dialog-information-sym
 SPOTIFY_CACHE_DIR = TMP_DIR / "eww_spotify"
 SPOTIFY_ALBUM_ART_DIR = SPOTIFY_CACHE_DIR / "album_art"
 
+# Spotify MPRIS D-Bus endpoint
+SPOTIFY_MPRIS_BUS_NAME = "org.mpris.MediaPlayer2.spotify"
+MPRIS_OBJECT_PATH = "/org/mpris/MediaPlayer2"
+
+# URL schemes accepted as album art sources
+ALBUM_ART_URL_SCHEMES = ('https://', 'http://', 'file://')
+
 # Notification file paths
 NOTIFICATION_FILE = TMP_DIR / "eww_notifications.json"
 NOTIFICATION_FILE_STR = str(NOTIFICATION_FILE)  # For use in shell commands
 NOTIFICATION_TEMP_FILE = TMP_DIR / "eww_notifications.tmp"
-NOTIFICATION_PERMISSION_TEST = TMP_DIR / "eww_notifier_permission_test"
 
 # Log file
 LOG_FILE = TMP_DIR / "eww_notifier.log"
@@ -18,9 +18,14 @@ from eww_notifier.config import (
     EWW_WIDGET_VAR
 )
 from eww_notifier.utils.error_handler import handle_error
+from eww_notifier.utils.file_utils import dumps_json
 
 logger = logging.getLogger(__name__)
 
+# Seconds after which an unchanged notification list is pushed to Eww again,
+# so the widget is restored after an eww reload or daemon restart
+WIDGET_REFRESH_INTERVAL = 5.0
+
 
 class NotificationQueue:
     """Queue for managing notifications with persistence.
@@ -43,6 +48,11 @@ class NotificationQueue:
             self.temp_file = NOTIFICATION_TEMP_FILE
             # No need to create directory since /tmp always exists
             self.last_update = 0
+            # Payload and time of the last successful Eww update, to skip
+            # pushing unchanged state; shared by the cleanup and main threads
+            self._last_widget_payload: Optional[str] = None
+            self._last_widget_push = 0.0
+            self._widget_lock = threading.Lock()
             self.notifications = []
             self._load_notifications()
             self._cleanup_old_notifications()
@@ -138,8 +148,7 @@ class NotificationQueue:
                 logger.info(f"Trimmed notifications to {MAX_NOTIFICATIONS} entries before saving")
 
             # Save to temporary file first
-            with open(self.temp_file, 'w') as f:
-                json.dump(self.notifications, f, indent=2)
+            self.temp_file.write_bytes(dumps_json(self.notifications))
 
             # Atomic rename to ensure file consistency
             self.temp_file.replace(self.cache_file)
@@ -196,22 +205,41 @@ class NotificationQueue:
         Raises:
             NotificationError: If adding fails
         """
+        self.add_notifications([notification])
+
+    def add_notifications(self, notifications: List[Dict[str, Any]]) -> None:
+        """Add a batch of notifications to the queue.
+
+        Cleanup and the Eww widget update run once for the whole batch.
+
+        Args:
+            notifications: Notification dictionaries to add, oldest first
+
+        Raises:
+            NotificationError: If adding fails
+        """
+        if not notifications:
+            return
+
         try:
-            # Add timestamp if not present
-            if 'timestamp' not in notification:
-                notification['timestamp'] = time.time()
+            # One clock read serves the whole batch
+            now = time.time()
+            for notification in notifications:
+                # Add timestamp if not present
+                if 'timestamp' not in notification:
+                    notification['timestamp'] = now
 
-            # Add expire_timeout if not present
-            if 'expire_timeout' not in notification:
-                notification['expire_timeout'] = DEFAULT_TIMEOUT
+                # Add expire_timeout if not present
+                if 'expire_timeout' not in notification:
+                    notification['expire_timeout'] = DEFAULT_TIMEOUT
 
             # Add to beginning of list (most recent first)
-            self.notifications.insert(0, notification)
+            self.notifications[:0] = reversed(notifications)
 
             # Ensure we don't exceed MAX_NOTIFICATIONS
             if len(self.notifications) > MAX_NOTIFICATIONS:
                 self.notifications = self.notifications[:MAX_NOTIFICATIONS]
-                logger.info(f"Trimmed notifications to {MAX_NOTIFICATIONS} entries after adding new notification")
+                logger.info(f"Trimmed notifications to {MAX_NOTIFICATIONS} entries after adding new notifications")
 
             # Clean up old notifications
             self._cleanup_old_notifications()
@@ -301,15 +329,26 @@ class NotificationQueue:
 
         try:
             # Convert to JSON string
-            notifications_json = json.dumps(self.notifications)
-
-            # Update Eww widget variable
-            result = subprocess.run(
-                ['eww', 'update', f'{EWW_WIDGET_VAR}={notifications_json}'],
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            notifications_json = dumps_json(self.notifications).decode()
+            with self._widget_lock:
+                now = time.time()
+                since_push = now - self._last_widget_push
+                if (notifications_json == self._last_widget_payload
+                        and since_push < WIDGET_REFRESH_INTERVAL):
+                    return
+                # Forget the memo first so a failed push is retried next time
+                self._last_widget_payload = None
+
+                # Update Eww widget variable
+                subprocess.run(
+                    ['eww', 'update',
+                     f'{EWW_WIDGET_VAR}={notifications_json}'],
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
+                self._last_widget_payload = notifications_json
+                self._last_widget_push = now
             logger.debug("Updated Eww notifications widget")
         except subprocess.CalledProcessError as e:
             handle_error(e, "Eww widget update", exit_on_error=False)
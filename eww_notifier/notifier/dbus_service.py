@@ -3,13 +3,12 @@ D-Bus service module for handling system notifications.
 
 This module provides:
 - D-Bus service implementation for system notifications
-- Signal handling for graceful shutdown
+- Signal handling for graceful shutdown on the GLib main loop
 - Notification capabilities and server information
 """
 
 import logging
 import signal
-import sys
 from typing import List, Dict, Any
 
 import dbus
@@ -17,6 +16,9 @@ import dbus.mainloop.glib
 import dbus.service
 from gi.repository import GLib
 
+from eww_notifier.notifier.notification_utils import DBUS_ZERO
+from eww_notifier.utils.icon_utils import clear_icon_caches
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,29 +61,46 @@ class DBusService(dbus.service.Object):
             self.logger = logger
             self.handle_error = handle_error
 
-            # Set up signal handlers
-            signal.signal(signal.SIGINT, self._handle_signal)
-            signal.signal(signal.SIGTERM, self._handle_signal)
+            # Set up signal handlers; GLib dispatches them on the main loop between
+            # D-Bus messages instead of interrupting whatever code is running
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self._handle_signal, signum)
+            # SIGHUP reloads icon lookups after a theme change
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGHUP, self._handle_reload, signal.SIGHUP)
 
             self.logger.info("D-Bus service initialized")
         except Exception as e:
             self.handle_error(e, "D-Bus service initialization", exit_on_error=True)
 
-    def _handle_signal(self, signum: int, _frame: Any) -> None:
+    def _handle_signal(self, signum: int) -> bool:
         """Handle system signals for graceful shutdown.
         
         This method:
         1. Logs the received signal
-        2. Quits the mainloop
-        3. Exits the process
+        2. Quits the mainloop, letting start() return so state can be flushed
         
         Args:
             signum: Signal number
-            _frame: Current stack frame
+
+        Returns:
+            False so GLib removes the signal source
         """
         self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         self.mainloop.quit()
-        sys.exit(0)
+        return False
+
+    def _handle_reload(self, signum: int) -> bool:
+        """Handle SIGHUP by clearing the memoized icon lookups.
+
+        Args:
+            signum: Signal number
+
+        Returns:
+            True so GLib keeps the signal source for later reloads
+        """
+        self.logger.info(f"Received signal {signum}, reloading icon caches...")
+        clear_icon_caches()
+        return True
 
     def start(self) -> None:
         """Start the D-Bus service.
@@ -137,13 +156,13 @@ class DBusService(dbus.service.Object):
             DBusError: If notification handling fails
         """
         try:
-            self.logger.debug(f"Received notification from {app_name}: {summary}")
+            self.logger.debug("Received notification from %s: %s", app_name, summary)
             return self.notification_handler.handle_notification(
                 app_name, replaces_id, app_icon, summary, body, actions, hints, expire_timeout
             )
         except Exception as e:
             self.handle_error(e, "notification handling", exit_on_error=False)
-            return dbus.UInt32(0)
+            return DBUS_ZERO
 
     @dbus.service.method(dbus_interface='org.freedesktop.Notifications', in_signature='u')
     def CloseNotification(self, notification_id: int) -> None:
@@ -161,7 +180,7 @@ class DBusService(dbus.service.Object):
             DBusError: If notification closing fails
         """
         try:
-            self.logger.debug(f"Closing notification {notification_id}")
+            self.logger.debug("Closing notification %s", notification_id)
             self.notification_handler.close_notification(notification_id)
         except Exception as e:
             self.handle_error(e, "notification closing", exit_on_error=False)
@@ -195,7 +214,7 @@ class DBusService(dbus.service.Object):
                 "action-icons",
                 "persistence"
             ]
-            self.logger.debug(f"Returning capabilities: {capabilities}")
+            self.logger.debug("Returning capabilities: %s", capabilities)
             return capabilities
         except Exception as e:
             self.handle_error(e, "capability retrieval", exit_on_error=False)
@@ -219,7 +238,7 @@ class DBusService(dbus.service.Object):
         """
         try:
             info = ("eww-notifier", "eww", "1.0", "1.2")
-            self.logger.debug(f"Returning server information: {info}")
+            self.logger.debug("Returning server information: %s", info)
             return info
         except Exception as e:
             self.handle_error(e, "server information retrieval", exit_on_error=False)
@@ -6,11 +6,17 @@ import logging
 from typing import Dict, Any, List, Optional
 
 import dbus
+from gi.repository import GLib
 
+from eww_notifier.notifier.notification_utils import DBUS_ZERO, Notification
 from eww_notifier.utils.error_handler import handle_error
 
 logger = logging.getLogger(__name__)
 
+# Window (in milliseconds) during which incoming notifications are buffered
+# before being flushed to the queue in a single batch
+BATCH_FLUSH_INTERVAL_MS = 10
+
 
 class NotificationHandler:
     """Notification handler for processing and managing system notifications.
@@ -35,6 +41,8 @@ class NotificationHandler:
             self.dbus_service = dbus_service
             self.logger = logger
             self.config = config
+            self._pending_batch: List[Notification] = []
+            self._flush_scheduled = False
             logger.info("Notification handler initialized")
         except Exception as e:
             handle_error(e, "notification handler initialization", exit_on_error=True)
@@ -50,6 +58,17 @@ class NotificationHandler:
             self.dbus_service.start()
         except Exception as e:
             handle_error(e, "notification handler", exit_on_error=True)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Flush buffered notifications and metadata once the main loop has stopped."""
+        try:
+            if self._pending_batch:
+                self._flush_batch()
+            self.spotify_handler.flush()
+            logger.info("Notification handler stopped")
+        except Exception as e:
+            handle_error(e, "notification handler shutdown", exit_on_error=False)
 
     def handle_notification(
             self,
@@ -81,19 +100,6 @@ class NotificationHandler:
             NotificationError: If handling fails
         """
         try:
-            # Log all hints for debugging
-            if app_name.lower() == 'spotify':
-                logger.info(f"Spotify notification received:")
-                logger.info(f"Summary: {summary}")
-                logger.info(f"Body: {body}")
-                if hints and isinstance(hints, dict):
-                    for key, value in hints.items():
-                        # Skip logging byte arrays and D-Bus variants
-                        if isinstance(value, (dbus.Array, dbus.Byte, dbus.ByteArray)):
-                            continue
-                        if isinstance(value, (str, int, float, bool)):
-                            logger.info(f"Hint '{key}': {value} (type: {type(value)})")
-
             # Process notification data
             notification = self.processor.process_notification_data(
                 app_name, replaces_id, app_icon, summary, body, actions, hints, expire_timeout
@@ -104,7 +110,7 @@ class NotificationHandler:
             return dbus.UInt32(int(notification['notification_id']))
         except Exception as e:
             handle_error(e, "notification handling", exit_on_error=False)
-            return dbus.UInt32(0)
+            return DBUS_ZERO
 
     def close_notification(self, notification_id: int) -> None:
         """Close a notification.
@@ -118,12 +124,16 @@ class NotificationHandler:
         try:
             notification_id = str(notification_id)
             self.remove_notification(notification_id)
-            logger.info(f"Closed notification {notification_id}")
+            logger.info("Closed notification %s", notification_id)
         except Exception as e:
             handle_error(e, "notification closing", exit_on_error=False)
 
-    def process_notification(self, notification: Dict[str, Any]) -> None:
-        """Process a notification dictionary and add it to the queue.
+    def process_notification(self, notification: Notification) -> None:
+        """Buffer a notification dictionary for batched insertion into the queue.
+
+        Notifications arriving within BATCH_FLUSH_INTERVAL_MS of each other are
+        flushed to the queue together, so a burst costs a single save and
+        widget update instead of one per notification.
         
         Args:
             notification: Notification dictionary to process
@@ -132,52 +142,57 @@ class NotificationHandler:
             NotificationError: If processing fails
         """
         try:
-            self.notification_queue.add_notification(notification)
-            logger.info(f"Processed notification: {notification.get('summary')}")
+            self._pending_batch.append(notification)
+            if not self._flush_scheduled:
+                GLib.timeout_add(BATCH_FLUSH_INTERVAL_MS, self._flush_batch)
+                self._flush_scheduled = True
+            logger.info("Processed notification: %s", notification.get('summary'))
         except Exception as e:
             handle_error(e, "notification processing", exit_on_error=False)
 
+    def _flush_batch(self) -> bool:
+        """Flush buffered notifications to the queue.
+
+        Returns:
+            False so GLib does not reschedule the timeout
+        """
+        try:
+            batch = self._pending_batch
+            self._pending_batch = []
+            self._flush_scheduled = False
+            self.notification_queue.add_notifications(batch)
+        except Exception as e:
+            handle_error(e, "notification batch flush", exit_on_error=False)
+        return False
+
     def remove_notification(self, notification_id: str) -> None:
         """Remove a notification from the queue.
         
+        Notifications still waiting in the pending batch are dropped too, so
+        closing one right after it was sent does not let it reappear on flush.
+
         Args:
             notification_id: ID of notification to remove
-            
-        Raises:
-            NotificationError: If removal fails
         """
-        try:
-            self.notification_queue.remove_notification(notification_id)
-        except Exception as e:
-            handle_error(e, "notification removal", exit_on_error=False)
+        if self._pending_batch:
+            self._pending_batch = [
+                n for n in self._pending_batch if n['notification_id'] != notification_id
+            ]
+        self.notification_queue.remove_notification(notification_id)
 
     def clear_notifications(self) -> None:
-        """Clear all notifications from the queue.
-        
-        Raises:
-            NotificationError: If clearing fails
-        """
-        try:
-            self.notification_queue.clear()
-        except Exception as e:
-            handle_error(e, "notification clearing", exit_on_error=False)
+        """Clear all notifications from the queue."""
+        self.notification_queue.clear()
 
-    def get_notifications(self) -> List[Dict[str, Any]]:
-        """Get all notifications from the queue.
+    def get_notifications(self) -> List[Notification]:
+        """Get all notifications from the queue, including pending ones.
         
         Returns:
-            List of notification dictionaries
-            
-        Raises:
-            NotificationError: If retrieval fails
+            List of notification dictionaries, most recent first
         """
-        try:
-            return self.notification_queue.get_notifications()
-        except Exception as e:
-            handle_error(e, "notification retrieval", exit_on_error=False)
-            return []
+        return self._pending_batch[::-1] + self.notification_queue.get_notifications()
 
-    def get_notification(self, notification_id: str) -> Optional[Dict[str, Any]]:
+    def get_notification(self, notification_id: str) -> Optional[Notification]:
         """Get a specific notification from the queue.
         
         Args:
@@ -185,12 +200,8 @@ class NotificationHandler:
             
         Returns:
             Notification dictionary or None if not found
-            
-        Raises:
-            NotificationError: If retrieval fails
         """
-        try:
-            return self.notification_queue.get_notification(notification_id)
-        except Exception as e:
-            handle_error(e, "notification retrieval", exit_on_error=False)
-            return None
+        for notification in self._pending_batch:
+            if notification['notification_id'] == notification_id:
+                return notification
+        return self.notification_queue.get_notification(notification_id)
@@ -8,18 +8,43 @@ This module provides functionality for:
 - Processing icons and images
 """
 
-import hashlib
-import time
+import sys
+from collections import OrderedDict
+from time import time as _now
 from typing import Dict, Any, Optional, Tuple, List
 
-import dbus
-
-from eww_notifier.config import DEFAULT_TIMEOUT
-from eww_notifier.icon_config import APP_ICONS
-from eww_notifier.notifier.notification_utils import get_urgency, process_actions, process_hints
-from eww_notifier.utils import find_icon_path
+from eww_notifier.config import (
+    DEFAULT_TIMEOUT,
+    ALBUM_ART_URL_SCHEMES,
+    SPOTIFY_MPRIS_BUS_NAME,
+    MPRIS_OBJECT_PATH
+)
+from eww_notifier.notifier.notification_utils import (
+    DBUS_SKIP_TYPES,
+    STRING_TYPES,
+    Notification,
+    get_urgency,
+    process_actions,
+    process_hints
+)
+from eww_notifier.utils import find_icon_path, get_session_bus
 from eww_notifier.utils.error_handler import handle_error, NotificationError
 
+# Largest notification ID representable as a D-Bus UInt32
+MAX_NOTIFICATION_ID = 0xFFFFFFFF
+
+# Number of recently resolved notification icons remembered
+RECENT_ICONS_SIZE = 64
+
+# Seconds within which a repeat notification reuses the icon resolved for it
+RECENT_ICON_WINDOW = 2.0
+
+# Hint keys that may carry album art, in priority order
+ALBUM_ART_HINT_KEYS = ('image-path', 'image_url', 'image')
+
+# Interned app key for Spotify, used to dispatch app-specific processing
+_SPOTIFY = sys.intern('spotify')
+
 
 class NotificationProcessor:
     """Processor for handling notification data.
@@ -45,44 +70,33 @@ class NotificationProcessor:
             self.logger = logger
             self.spotify_handler = spotify_handler
             self.notification_id_counter = 1
+            # (app key, app icon) -> (icon path, time resolved), oldest first
+            self._recent_icons: 'OrderedDict[Tuple[str, str], Tuple[str, float]]' = OrderedDict()
+            self._app_handlers = {_SPOTIFY: self.handle_spotify_notification}
+            self._spotify_proxy = None
+            self._spotify_subscription = None
+            self._spotify_owner_watched = False
+            self._cached_metadata: Dict[str, Any] = {}
             self.logger.info("Notification processor initialized")
         except Exception as e:
             handle_error(e, "notification processor initialization", exit_on_error=True)
 
-    def generate_notification_id(self, app_name: str, summary: str, body: str) -> int:
+    def generate_notification_id(self) -> int:
         """Generate a unique notification ID within valid D-Bus range.
         
-        The ID is generated using a combination of:
-        - A counter that resets at max D-Bus value
-        - MD5 hash of app name, summary, body, and counter
+        IDs come from a counter that wraps back to 1 after the maximum
+        D-Bus UInt32 value; 0 is reserved for "no notification".
         
-        Args:
-            app_name: Name of the application
-            summary: Notification summary
-            body: Notification body
-            
         Returns:
             A unique notification ID in valid D-Bus range
-            
-        Raises:
-            NotificationError: If ID generation fails
         """
-        try:
-            if self.notification_id_counter >= 4294967295:  # Reset if we reach max
-                self.notification_id_counter = 1
-                self.logger.info("Reset notification ID counter")
-
-            # Use a combination of counter and hash for uniqueness
-            unique_str = f"{app_name}{summary}{body}{self.notification_id_counter}"
-            hash_obj = hashlib.md5(unique_str.encode())
-            # Take first 4 bytes of hash and convert to integer
-            notification_id = int.from_bytes(hash_obj.digest()[:4], byteorder='big')
-            self.notification_id_counter += 1
-            self.logger.debug(f"Generated notification ID: {notification_id}")
-            return notification_id
-        except Exception as e:
-            handle_error(e, "notification ID generation", exit_on_error=False)
-            raise NotificationError("Failed to generate notification ID") from e
+        notification_id = self.notification_id_counter
+        if notification_id >= MAX_NOTIFICATION_ID:  # Reset if we reach max
+            self.notification_id_counter = 1
+            self.logger.info("Reset notification ID counter")
+        else:
+            self.notification_id_counter = notification_id + 1
+        return notification_id
 
     def process_notification_data(
             self,
@@ -94,7 +108,7 @@ class NotificationProcessor:
             actions: List[str],
             hints: Dict[str, Any],
             expire_timeout: int
-    ) -> Dict[str, Any]:
+    ) -> Notification:
         """Process notification data into a standardized format.
         
         This method:
@@ -120,103 +134,134 @@ class NotificationProcessor:
             NotificationError: If processing fails
         """
         try:
+            now = _now()
+            if expire_timeout <= 0:
+                expire_timeout = DEFAULT_TIMEOUT
+
             # Generate a unique ID for this notification
-            notif_id = replaces_id if replaces_id else self.generate_notification_id(app_name, summary, body)
-            self.logger.debug(f"Processing notification {notif_id} from {app_name}")
+            notif_id = replaces_id if replaces_id else self.generate_notification_id()
+            self.logger.debug("Processing notification %s from %s", notif_id, app_name)
+            app_key = sys.intern(app_name.lower())
+
+            icon = self._resolve_icon(app_key, app_icon, now)
 
             # Process notification data
-            notification = {
+            notification: Notification = {
                 'notification_id': str(notif_id),
                 'app': app_name,
                 'summary': summary,
                 'body': body,
-                'icon': find_icon_path(app_icon or app_name.lower()),
+                'icon': icon,
                 'image': None,
                 'urgency': get_urgency(hints),
                 'actions': process_actions(actions),
                 'hints': process_hints(hints),
-                'timestamp': time.time(),
-                'expire_timeout': expire_timeout if expire_timeout > 0 else DEFAULT_TIMEOUT
+                'timestamp': now,
+                'expire_timeout': expire_timeout
             }
 
-            # Get icon and image
-            notification['icon'], notification['image'] = self.get_icon_and_image(app_name, app_icon, hints)
+            # Hand off to app-specific processing, if any
+            app_handler = self._app_handlers.get(app_key)
+            if app_handler is not None:
+                app_handler(notification, hints)
 
-            # Handle Spotify notifications specially
-            if app_name.lower() == 'spotify':
-                self.handle_spotify_notification(notification, hints)
-
-            self.logger.debug(f"Successfully processed notification {notif_id}")
+            self.logger.debug("Successfully processed notification %s", notif_id)
             return notification
         except Exception as e:
             handle_error(e, "notification processing", exit_on_error=False)
             raise NotificationError("Failed to process notification") from e
 
-    def get_icon_and_image(self, app_name: str, app_icon: str, hints: Dict[str, Any]) -> Tuple[str, Optional[str]]:
-        """Get both the app icon and any associated image (like album art).
+    def _resolve_icon(self, app_key: str, app_icon: str, now: float) -> str:
+        """Find the icon for a notification, reusing a lookup made moments ago.
         
-        This method:
-        1. Gets the default app icon
-        2. For Spotify, tries to get album art from:
-           - MPRIS metadata
-           - Notification hints
+        Bursts of notifications from one app resolve their icon once; every
+        other field is still built from the incoming notification.
         
         Args:
-            app_name: Name of the application
-            app_icon: Icon name or path
-            hints: Dictionary of hints
+            app_key: Interned, lower-cased application name
+            app_icon: Icon name or path sent with the notification
+            now: Current timestamp
             
         Returns:
-            Tuple of (icon_path, image_path)
+            Path to the icon file
+        """
+        key = (app_key, app_icon)
+        cached = self._recent_icons.get(key)
+        if cached is not None and now - cached[1] < RECENT_ICON_WINDOW:
+            self._recent_icons.move_to_end(key)
+            return cached[0]
+
+        icon = find_icon_path(app_icon or app_key)
+        self._recent_icons[key] = (icon, now)
+        self._recent_icons.move_to_end(key)
+        if len(self._recent_icons) > RECENT_ICONS_SIZE:
+            self._recent_icons.popitem(last=False)
+        return icon
+
+    def _ensure_spotify_proxy(self) -> bool:
+        """Create the Spotify MPRIS proxy once and keep its metadata cached.
+
+        Metadata is refreshed from PropertiesChanged signals, so reading it on
+        the notification path needs no D-Bus round trip. The proxy is dropped
+        when Spotify leaves the bus and recreated on the next notification.
+
+        Returns:
+            True if the proxy is available, False if pydbus is not installed
             
         Raises:
-            NotificationError: If icon/image retrieval fails
+            Exception: If Spotify is not reachable over D-Bus
         """
-        try:
-            # Default values
-            icon = find_icon_path(app_icon or app_name.lower())
-            image = None
-
-            # Handle Spotify album art
-            if app_name.lower() == 'spotify':
-                # Try MPRIS first
-                try:
-                    from pydbus import SessionBus
-                    bus = SessionBus()
-                    spotify = bus.get("org.mpris.MediaPlayer2.spotify", "/org/mpris/MediaPlayer2")
-                    metadata = spotify.Metadata
-                    url = metadata.get("mpris:artUrl", "")
-                    if url.startswith("https://"):
-                        self.logger.info(f"Got album art URL from MPRIS: {url}")
-                        album_art_path = self.spotify_handler.get_album_art_path("mpris")
-                        if album_art_path:
-                            self.logger.info(f"Using album art from MPRIS: {album_art_path}")
-                            image = album_art_path
-                except Exception as e:
-                    self.logger.warning(f"Failed to get album art from MPRIS: {e}")
-
-                # Fallback to notification hints if MPRIS fails
-                if not image and hints:
-                    # Try to get album art from hints
-                    for key, value in hints.items():
-                        if isinstance(value, str) and value.startswith('https://'):
-                            album_art_path = self.spotify_handler.get_album_art_path(value)
-                            if album_art_path:
-                                self.logger.info(f"Using album art from hints: {album_art_path}")
-                                image = album_art_path
-                                break
-
-            return icon, image
+        if self._spotify_proxy is not None:
+            return True
+
+        bus = get_session_bus()
+        if bus is None:
+            return False
+        proxy = bus.get(SPOTIFY_MPRIS_BUS_NAME, MPRIS_OBJECT_PATH)
+        self._cached_metadata = dict(proxy.Metadata)
+        self._spotify_subscription = proxy.PropertiesChanged.connect(
+            self._on_spotify_properties_changed
+        )
+        if not self._spotify_owner_watched:
+            bus.dbus.NameOwnerChanged.connect(self._on_name_owner_changed)
+            self._spotify_owner_watched = True
+        self._spotify_proxy = proxy
+        return True
+
+    def _on_spotify_properties_changed(self, _interface: str, changed: Dict[str, Any], _invalidated: List[str]) -> None:
+        """Update cached Spotify metadata from a PropertiesChanged signal."""
+        if 'Metadata' in changed:
+            self._cached_metadata = dict(changed['Metadata'])
 
+    def _on_name_owner_changed(self, name: str, _old_owner: str, new_owner: str) -> None:
+        """Drop the Spotify proxy when Spotify disconnects from the bus."""
+        if name == SPOTIFY_MPRIS_BUS_NAME and not new_owner:
+            if self._spotify_subscription is not None:
+                self._spotify_subscription.disconnect()
+                self._spotify_subscription = None
+            self._spotify_proxy = None
+            self._cached_metadata = {}
+
+    def _get_mpris_art_url(self) -> Optional[str]:
+        """Get the current album art URL published by Spotify over MPRIS.
+
+        Returns:
+            The art URL, or None if MPRIS is unavailable or has no usable URL
+        """
+        try:
+            if not self._ensure_spotify_proxy():
+                return None
         except Exception as e:
-            handle_error(e, "icon/image retrieval", exit_on_error=False)
-            return find_icon_path(APP_ICONS['default']), None
+            self.logger.warning("Failed to get album art from MPRIS: %s", e)
+            return None
+        url = self._cached_metadata.get("mpris:artUrl", "")
+        return url if url.startswith(ALBUM_ART_URL_SCHEMES) else None
 
-    def handle_spotify_notification(self, notification: Dict[str, Any], hints: Dict[str, Any]) -> None:
+    def handle_spotify_notification(self, notification: Notification, hints: Dict[str, Any]) -> None:
         """Handle Spotify-specific notification features.
         
         This method:
-        1. Extracts album art URL from hints
+        1. Extracts album art URL from hints, falling back to MPRIS metadata
         2. Downloads and caches album art
         3. Updates notification with album art path
         4. Updates Spotify metadata
@@ -229,35 +274,55 @@ class NotificationProcessor:
             NotificationError: If Spotify handling fails
         """
         try:
-            # Extract album art URL from hints
-            album_art_url = None
-            if hints and isinstance(hints, dict):
-                # Skip byte arrays and only process string values
+            log_info = self.logger.info
+            get_album_art_path = self.spotify_handler.get_album_art_path
+
+            # Log all hints for debugging
+            log_info("Spotify notification received:")
+            log_info("Summary: %s", notification['summary'])
+            log_info("Body: %s", notification['body'])
+            if hints:
                 for key, value in hints.items():
-                    if isinstance(value, (dbus.Array, dbus.Byte, dbus.ByteArray)):
+                    # Skip logging byte arrays and D-Bus variants
+                    if type(value) in DBUS_SKIP_TYPES:
                         continue
-                    if key == 'image-path' and isinstance(value, str):
-                        album_art_url = value
-                        self.logger.debug(f"Found album art URL in image-path: {album_art_url}")
-                        break
-                    elif key in ['image_url', 'image'] and isinstance(value, str):
+                    if isinstance(value, (str, int, float, bool)):
+                        log_info("Hint '%s': %s (type: %s)", key, value, type(value))
+
+            # Extract album art URL from hints
+            album_art_url = None
+            if hints:
+                # Look up the known image keys in priority order
+                get_hint = hints.get
+                for key in ALBUM_ART_HINT_KEYS:
+                    value = get_hint(key)
+                    if value and type(value) in STRING_TYPES:
                         album_art_url = value
-                        self.logger.debug(f"Found album art URL in hint '{key}': {album_art_url}")
+                        self.logger.debug("Found album art URL in hint '%s': %s", key, album_art_url)
                         break
 
             if album_art_url:
                 # Add image URL to notification
                 notification['image'] = album_art_url
-                self.logger.info(f"Added image URL to notification: {album_art_url}")
+                log_info("Added image URL to notification: %s", album_art_url)
 
                 # Get album art path
-                album_art_path = self.spotify_handler.get_album_art_path(album_art_url)
+                album_art_path = get_album_art_path(album_art_url)
                 if album_art_path:
                     # Update notification with album art path
                     notification['image'] = album_art_path
-                    self.logger.info(f"Updated Spotify notification with album art: {album_art_path}")
+                    log_info("Updated Spotify notification with album art: %s", album_art_path)
                 else:
-                    self.logger.warning(f"Failed to get album art path for URL: {album_art_url}")
+                    self.logger.warning("Failed to get album art path for URL: %s", album_art_url)
+            else:
+                # Fall back to the art URL Spotify publishes over MPRIS
+                album_art_url = self._get_mpris_art_url()
+                if album_art_url:
+                    log_info("Got album art URL from MPRIS: %s", album_art_url)
+                    album_art_path = get_album_art_path(album_art_url)
+                    if album_art_path:
+                        notification['image'] = album_art_path
+                        log_info("Using album art from MPRIS: %s", album_art_path)
 
             # Update metadata
             metadata = {
@@ -270,7 +335,3 @@ class NotificationProcessor:
         except Exception as e:
             handle_error(e, "Spotify notification handling", exit_on_error=False)
             raise NotificationError("Failed to handle Spotify notification") from e
-
-    def process_notification(self, notification):
-        self.logger.info(f"Processing notification: {notification}")
-        # Add notification processing logic here
@@ -5,10 +5,11 @@ This module provides utility functions for:
 - Processing notification urgency levels
 - Processing notification actions
 - Processing notification hints
+- Describing the shape of processed notifications
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, TypedDict
 
 import dbus
 
@@ -17,6 +18,56 @@ from eww_notifier.utils.error_handler import handle_error
 
 logger = logging.getLogger(__name__)
 
+# Hints arrive through the Notify method's D-Bus signature ('a{sv}'), so they
+# are always a dict-like; only emptiness needs checking.
+
+# Exact types kept as-is by process_hints; checked by identity to skip MRO walks
+_SCALAR_TYPES = frozenset({
+    str, int, float, bool,
+    dbus.String, dbus.ObjectPath, dbus.Signature,
+    dbus.Int16, dbus.UInt16, dbus.Int32, dbus.UInt32, dbus.Int64, dbus.UInt64,
+    dbus.Double, dbus.Boolean,
+})
+
+# Exact string types a hint value can arrive as
+STRING_TYPES = frozenset({str, dbus.String})
+
+# Byte arrays and D-Bus containers that are never copied into processed hints
+DBUS_SKIP_TYPES = frozenset({dbus.Array, dbus.Byte, dbus.ByteArray})
+
+# Returned on every failed Notify call; UInt32 is immutable so one instance is shared
+DBUS_ZERO = dbus.UInt32(0)
+
+# Type tags for the isinstance fallback, built once instead of on every hint
+_SIMPLE_TYPES = (str, int, float, bool)
+
+
+class NotificationAction(TypedDict):
+    """A single action button attached to a notification."""
+
+    notification_id: str
+    label: str
+
+
+class Notification(TypedDict):
+    """A processed notification as stored in the queue and written to eww.
+
+    Notifications stay plain dicts so they can be serialized directly;
+    this type only pins down the fixed set of keys.
+    """
+
+    notification_id: str
+    app: str
+    summary: str
+    body: str
+    icon: str
+    image: Optional[str]
+    urgency: str
+    actions: List[NotificationAction]
+    hints: Dict[str, Any]
+    timestamp: float
+    expire_timeout: int
+
 
 def get_urgency(hints: Dict[str, Any]) -> str:
     """Get the urgency level from notification hints.
@@ -36,11 +87,11 @@ def get_urgency(hints: Dict[str, Any]) -> str:
         NotificationError: If processing fails
     """
     try:
-        if hints and isinstance(hints, dict):
+        if hints:
             urgency = hints.get('urgency')
             if urgency is not None:
                 level = URGENCY_LEVELS.get(urgency, 'normal')
-                logger.debug(f"Got urgency level: {level}")
+                logger.debug("Got urgency level: %s", level)
                 return level
         return 'normal'
     except Exception as e:
@@ -48,7 +99,7 @@ def get_urgency(hints: Dict[str, Any]) -> str:
         return 'normal'
 
 
-def process_actions(actions: List[str]) -> List[Dict[str, str]]:
+def process_actions(actions: List[str]) -> List[NotificationAction]:
     """Process notification actions into a list of dictionaries.
     
     This function:
@@ -66,17 +117,11 @@ def process_actions(actions: List[str]) -> List[Dict[str, str]]:
         NotificationError: If processing fails
     """
     try:
-        processed_actions = []
-        if actions and isinstance(actions, list):
-            for i in range(0, len(actions), 2):
-                if i + 1 < len(actions):
-                    action = {
-                        'notification_id': actions[i],
-                        'label': actions[i + 1]
-                    }
-                    processed_actions.append(action)
-                    logger.debug(f"Processed action: {action}")
-        return processed_actions
+        if not actions:
+            return []
+        # Pair up (id, label) from a single iterator; a trailing odd element is dropped
+        it = iter(actions)
+        return [{'notification_id': action_id, 'label': label} for action_id, label in zip(it, it)]
     except Exception as e:
         handle_error(e, "action processing", exit_on_error=False)
         return []
@@ -100,29 +145,38 @@ def process_hints(hints: Dict[str, Any]) -> Dict[str, Any]:
         NotificationError: If processing fails
     """
     try:
-        processed_hints = {}
-        if hints and isinstance(hints, dict):
-            for key, value in hints.items():
-                # Skip byte arrays and D-Bus variants
-                if isinstance(value, (dbus.Array, dbus.Byte, dbus.ByteArray)):
-                    logger.debug(f"Skipping D-Bus array/byte for key: {key}")
-                    continue
-
-                # Handle simple types
-                if isinstance(value, (str, int, float, bool)):
-                    processed_hints[key] = value
-                    logger.debug(f"Processed hint {key}: {value}")
-
-                # Handle D-Bus variants
-                elif hasattr(value, 'unpack'):
-                    try:
-                        unpacked = value.unpack()
-                        # Skip byte arrays in unpacked values too
-                        if not isinstance(unpacked, (dbus.Array, dbus.Byte, dbus.ByteArray)):
-                            processed_hints[key] = unpacked
-                            logger.debug(f"Unpacked hint {key}: {unpacked}")
-                    except Exception as e:
-                        logger.warning(f"Failed to unpack D-Bus variant for key {key}: {e}")
+        if not hints:
+            return {}
+
+        # Fast path: exact scalar types, which covers nearly every hint
+        processed_hints = {key: value for key, value in hints.items() if type(value) in _SCALAR_TYPES}
+        if len(processed_hints) == len(hints):
+            return processed_hints
+
+        log_debug = logger.debug
+        for key, value in hints.items():
+            if key in processed_hints:
+                continue
+
+            # Skip byte arrays and D-Bus variants
+            if type(value) in DBUS_SKIP_TYPES:
+                log_debug("Skipping D-Bus array/byte for key: %s", key)
+                continue
+
+            # Handle subclasses of simple types
+            if isinstance(value, _SIMPLE_TYPES):
+                processed_hints[key] = value
+
+            # Handle D-Bus variants
+            elif hasattr(value, 'unpack'):
+                try:
+                    unpacked = value.unpack()
+                    # Skip byte arrays in unpacked values too
+                    if type(unpacked) not in DBUS_SKIP_TYPES:
+                        processed_hints[key] = unpacked
+                        log_debug("Unpacked hint %s: %s", key, unpacked)
+                except Exception as e:
+                    logger.warning("Failed to unpack D-Bus variant for key %s: %s", key, e)
 
         return processed_hints
     except Exception as e:
@@ -3,13 +3,19 @@ Album art handler for Spotify notifications.
 """
 
 import hashlib
-import json
 import logging
 import os
+import shutil
+import sqlite3
+import sys
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from eww_notifier.config import (
     SPOTIFY_CACHE_DIR,
@@ -17,10 +23,26 @@ from eww_notifier.config import (
     SPOTIFY_CACHE_MAX_SIZE,
     SPOTIFY_CACHE_MAX_AGE
 )
+from eww_notifier.utils.file_utils import read_json_file, scan_directory_files
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Legacy filename hashing is not security sensitive; the flag is new in 3.9
+_MD5_KWARGS = {'usedforsecurity': False} if sys.version_info >= (3, 9) else {}
+
+# Seconds a caller waits for another caller's download of the same URL
+DOWNLOAD_WAIT_TIMEOUT = 10.0
+
+# Bytes copied from the socket to disk per read when downloading album art
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Length of the hex digest used in cache filenames (same as the old MD5 names)
+URL_HASH_LENGTH = 32
+
+# Seconds for which a successful existence check of a cached file is trusted
+PATH_EXISTS_TTL = 5.0
+
 
 class AlbumArtHandler:
     """Handles album art downloading and caching for Spotify notifications."""
@@ -28,13 +50,33 @@ class AlbumArtHandler:
     def __init__(self):
         """Initialize album art handler with cache directory."""
         self.ALBUM_ART_DIR = SPOTIFY_ALBUM_ART_DIR
-        self.ALBUM_ART_CACHE = SPOTIFY_CACHE_DIR / "url_cache.json"
+        self.ALBUM_ART_CACHE = SPOTIFY_CACHE_DIR / "url_cache.sqlite"
+        # JSON URL cache written by earlier versions, imported once into SQLite
+        self.LEGACY_ALBUM_ART_CACHE = SPOTIFY_CACHE_DIR / "url_cache.json"
 
         # Cache settings from config
         self.MAX_CACHE_SIZE = SPOTIFY_CACHE_MAX_SIZE
         self.MAX_CACHE_AGE = SPOTIFY_CACHE_MAX_AGE
 
-        self.album_art_cache: Dict[str, str] = {}
+        # URL -> path, least recently used first
+        self.album_art_cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+
+        # Keep-alive session so repeat downloads from the same CDN skip the
+        # TCP/TLS handshake
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._path_exists_cache: Dict[str, float] = {}
+        # URL -> last use time of cache hits not yet written to SQLite
+        self._pending_touches: Dict[str, float] = {}
+
+        # Downloads in progress, so concurrent requests for one URL share a
+        # single GET
+        self._inflight: Dict[str, threading.Event] = {}
+        # Guards the URL cache, in-flight downloads and the SQLite connection
+        self._lock = threading.RLock()
 
         # Set up cache
         self.setup_cache()
@@ -43,35 +85,182 @@ class AlbumArtHandler:
         """Set up the album art cache directory and load existing cache."""
         try:
             self.ALBUM_ART_DIR.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode: each insert/delete is its own small WAL write
+            self._db = sqlite3.connect(
+                str(self.ALBUM_ART_CACHE),
+                isolation_level=None,
+                check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # The cache can be rebuilt from the network, so skip the fsync on
+            # every commit
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS art "
+                "(url TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                "last_used REAL NOT NULL DEFAULT 0)"
+            )
+            table_info = self._db.execute("PRAGMA table_info(art)")
+            if 'last_used' not in {row[1] for row in table_info}:
+                self._db.execute(
+                    "ALTER TABLE art "
+                    "ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                )
+            self._import_legacy_url_cache()
             self.load_album_art_cache()
+            self._migrate_legacy_filenames()
         except Exception as e:
             logger.error(f"Failed to setup cache: {e}")
 
+    @staticmethod
+    def _url_hash(url: str) -> str:
+        """Hash a URL into the hex name of its cache file."""
+        return hashlib.sha256(url.encode()).hexdigest()[:URL_HASH_LENGTH]
+
+    def _import_legacy_url_cache(self) -> None:
+        """Copy the legacy JSON URL cache into SQLite and remove it."""
+        if self._db is None or not self.LEGACY_ALBUM_ART_CACHE.exists():
+            return
+        try:
+            entries = read_json_file(self.LEGACY_ALBUM_ART_CACHE)
+            self._execute_batch(
+                "INSERT OR IGNORE INTO art (url, path) VALUES (?, ?)",
+                entries.items()
+            )
+            self.LEGACY_ALBUM_ART_CACHE.unlink()
+            logger.info(
+                f"Imported {len(entries)} entries from legacy album art cache"
+            )
+        except Exception as e:
+            logger.error(f"Failed to import legacy album art cache: {e}")
+
+    def _execute_batch(self, sql: str, rows: Iterable[Tuple]) -> None:
+        """Run one statement for many rows inside a single transaction."""
+        db = self._db
+        if db is None:
+            return
+        db.execute("BEGIN")
+        try:
+            db.executemany(sql, rows)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _migrate_legacy_filenames(self) -> None:
+        """Rename cache files still named after the MD5 of their URL."""
+        for url, path in list(self.album_art_cache.items()):
+            legacy_hash = hashlib.md5(url.encode(), **_MD5_KWARGS).hexdigest()
+            legacy_name = f"{legacy_hash}.jpg"
+            if os.path.basename(path) != legacy_name:
+                continue
+            new_path = str(self.ALBUM_ART_DIR / f"{self._url_hash(url)}.jpg")
+            try:
+                os.replace(path, new_path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Failed to migrate cache file {path}: {e}")
+                continue
+            self._store_cache_entry(url, new_path)
+
     def get_cache_size(self) -> float:
         """Get total size of album art cache in megabytes."""
         try:
-            total_size = sum(f.stat().st_size for f in self.ALBUM_ART_DIR.glob('*') if f.is_file())
+            files = scan_directory_files(self.ALBUM_ART_DIR)
+            total_size = sum(size for _, size, _ in files)
             return total_size / (1024 * 1024)  # Convert to MB
         except Exception as e:
             logger.error(f"Error getting cache size: {e}")
             return 0.0
 
     def load_album_art_cache(self) -> None:
-        """Load the album art URL cache and metadata from disk."""
+        """Load the album art URL cache from disk."""
         try:
-            if self.ALBUM_ART_CACHE.exists():
-                with open(self.ALBUM_ART_CACHE, 'r') as f:
-                    self.album_art_cache.update(json.load(f))
+            if self._db is not None:
+                self.album_art_cache.update(self._db.execute(
+                    "SELECT url, path FROM art ORDER BY last_used, rowid"
+                ))
         except Exception as e:
             logger.error(f"Failed to load album art cache: {e}")
 
-    def save_album_art_cache(self) -> None:
-        """Save the album art URL cache and metadata to disk."""
+    def _store_cache_entry(self, url: str, path: str) -> None:
+        """Record a downloaded URL in the in-memory and on-disk cache."""
         try:
-            with open(self.ALBUM_ART_CACHE, 'w') as f:
-                json.dump(self.album_art_cache, f, indent=2)
+            with self._lock:
+                self.album_art_cache[url] = path
+                self.album_art_cache.move_to_end(url)
+                self._pending_touches.pop(url, None)
+                if self._db is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO art (url, path, last_used) "
+                        "VALUES (?, ?, ?)",
+                        (url, path, time.time())
+                    )
         except Exception as e:
-            logger.error(f"Failed to save album art cache: {e}")
+            logger.error(f"Failed to save album art cache entry: {e}")
+
+    def _touch_cache_entry(self, url: str) -> None:
+        """Mark a cached URL as most recently used.
+
+        Only the in-memory order changes on a cache hit; the last use time is
+        written to SQLite in bulk by flush().
+        """
+        with self._lock:
+            self.album_art_cache.move_to_end(url)
+            self._pending_touches[url] = time.time()
+
+    def flush(self) -> None:
+        """Write the last use times of recent cache hits in one transaction."""
+        try:
+            with self._lock:
+                if not self._pending_touches or self._db is None:
+                    return
+                touches = self._pending_touches
+                self._pending_touches = {}
+                self._execute_batch(
+                    "UPDATE art SET last_used = ? WHERE url = ?",
+                    [(last_used, url) for url, last_used in touches.items()]
+                )
+        except Exception as e:
+            logger.error(f"Failed to update album art cache entries: {e}")
+
+    def _forget_cached_files(self, file_paths: List[str]) -> None:
+        """Drop all cache state for files that were removed from disk.
+
+        Args:
+            file_paths: Paths of the removed files
+        """
+        try:
+            with self._lock:
+                removed = set(file_paths)
+                for url, path in list(self.album_art_cache.items()):
+                    if path in removed:
+                        del self.album_art_cache[url]
+                for path in file_paths:
+                    self._path_exists_cache.pop(path, None)
+                self._execute_batch(
+                    "DELETE FROM art WHERE path = ?",
+                    [(path,) for path in file_paths]
+                )
+        except Exception as e:
+            logger.error(f"Failed to delete album art cache entries: {e}")
+
+    def _cached_exists(self, path: str) -> bool:
+        """Check whether a path exists, trusting recent positive results.
+
+        Repeat notifications for the same track skip the stat() call for
+        PATH_EXISTS_TTL seconds after the file was last seen.
+        """
+        now = time.time()
+        if now - self._path_exists_cache.get(path, 0) < PATH_EXISTS_TTL:
+            return True
+        exists = os.path.exists(path)
+        if exists:
+            self._path_exists_cache[path] = now
+        else:
+            self._path_exists_cache.pop(path, None)
+        return exists
 
     def get_album_art_path(self, url: str) -> Optional[str]:
         """Get the local path for an album art URL, downloading if necessary."""
@@ -79,27 +268,61 @@ class AlbumArtHandler:
             return None
 
         try:
+            # Local files are used in place rather than copied into the cache
+            if url.startswith('file://'):
+                local_path = unquote(urlparse(url).path)
+                return local_path if self._cached_exists(local_path) else None
+
             # Generate a hash of the URL for the filename
-            url_hash = hashlib.md5(url.encode()).hexdigest()
+            url_hash = self._url_hash(url)
 
             # Check if we already have this URL cached
-            if url in self.album_art_cache:
-                cached_path = self.album_art_cache[url]
-                if os.path.exists(cached_path):
-                    return cached_path
+            cached_path = self.album_art_cache.get(url)
+            if cached_path and self._cached_exists(cached_path):
+                self._touch_cache_entry(url)
+                return cached_path
 
-            # Download the image
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            with self._lock:
+                event = self._inflight.get(url)
+                if event is None:
+                    event = self._inflight[url] = threading.Event()
+                    is_owner = True
+                else:
+                    is_owner = False
 
-            # Save to cache
-            file_path = self.ALBUM_ART_DIR / f"{url_hash}.jpg"
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+            if not is_owner:
+                # Another caller is downloading this URL; reuse its result
+                event.wait(DOWNLOAD_WAIT_TIMEOUT)
+                cached_path = self.album_art_cache.get(url)
+                if cached_path and self._cached_exists(cached_path):
+                    return cached_path
+                return None
 
-            # Update cache
-            self.album_art_cache[url] = str(file_path)
-            self.save_album_art_cache()
+            try:
+                # Stream the image to a temporary file so a partial download
+                # is never a cache hit
+                file_path = self.ALBUM_ART_DIR / f"{url_hash}.jpg"
+                tmp_path = file_path.with_name(file_path.name + '.part')
+                try:
+                    response = self._session.get(url, timeout=5, stream=True)
+                    with response:
+                        response.raise_for_status()
+                        response.raw.decode_content = True
+                        with open(tmp_path, 'wb') as f:
+                            shutil.copyfileobj(
+                                response.raw, f, DOWNLOAD_CHUNK_SIZE
+                            )
+                    os.replace(tmp_path, file_path)
+                except Exception:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+
+                # Update cache
+                self._store_cache_entry(url, str(file_path))
+            finally:
+                with self._lock:
+                    del self._inflight[url]
+                event.set()
 
             return str(file_path)
         except Exception as e:
@@ -107,57 +330,86 @@ class AlbumArtHandler:
             return None
 
     def cleanup_cache(self) -> None:
-        """Clean up old and oversized cache entries."""
+        """Clean up old and oversized cache entries.
+
+        Safe to call from a background thread. The cache lock is only held to
+        snapshot the cache and to drop evicted entries, not while files are
+        deleted, so lookups on the main loop are not blocked by the sweep.
+        Pending last use times are written out afterwards.
+        """
         try:
-            current_time = time.time()
+            with self._lock:
+                lru_paths = list(self.album_art_cache.values())
+                busy_paths = {
+                    str(self.ALBUM_ART_DIR / f"{self._url_hash(url)}.jpg")
+                    for url in self._inflight
+                }
+            removed = self._evict_files(lru_paths, busy_paths)
+            if removed:
+                self._forget_cached_files(removed)
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error cleaning up cache: {e}")
 
-            # Remove old files
-            for file_path in self.ALBUM_ART_DIR.glob('*'):
-                if not file_path.is_file():
-                    continue
+    def _evict_files(
+            self, lru_paths: List[str], busy_paths: Set[str]
+    ) -> List[str]:
+        """Delete old files, then the least valuable ones until the cache fits.
 
-                file_age = current_time - file_path.stat().st_mtime
-                if file_age > self.MAX_CACHE_AGE:
-                    try:
-                        file_path.unlink()
-                        # Remove from cache
-                        self.album_art_cache = {
-                            url: path for url, path in self.album_art_cache.items()
-                            if path != str(file_path)
-                        }
-                        logger.info(f"Removed old cache file: {file_path}")
-                    except Exception as e:
-                        logger.error(f"Error removing old cache file {file_path}: {e}")
-
-            # Check total size
-            total_size = sum(f.stat().st_size for f in self.ALBUM_ART_DIR.glob('*') if f.is_file())
-            if total_size > self.MAX_CACHE_SIZE:
-                # Sort files by modification time (oldest first)
-                files = sorted(
-                    self.ALBUM_ART_DIR.glob('*'),
-                    key=lambda x: x.stat().st_mtime
-                )
+        Partial downloads and files of downloads in progress are never touched.
 
-                # Remove files until we're under the limit
-                for file_path in files:
-                    if total_size <= self.MAX_CACHE_SIZE:
-                        break
-
-                    try:
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        total_size -= file_size
-                        # Remove from cache
-                        self.album_art_cache = {
-                            url: path for url, path in self.album_art_cache.items()
-                            if path != str(file_path)
-                        }
-                        logger.info(f"Removed oversized cache file: {file_path}")
-                    except Exception as e:
-                        logger.error(f"Error removing oversized cache file {file_path}: {e}")
-
-            # Save updated cache
-            self.save_album_art_cache()
+        Args:
+            lru_paths: Paths of tracked files, least recently used first
+            busy_paths: Paths of files currently being downloaded
 
-        except Exception as e:
-            logger.error(f"Error cleaning up cache: {e}")
+        Returns:
+            Paths of the deleted files
+        """
+        current_time = time.time()
+        removed = []
+
+        # Remove old files, keeping (mtime, size, path) of the rest for the
+        # size pass
+        remaining = []
+        total_size = 0
+        files = scan_directory_files(self.ALBUM_ART_DIR)
+        for file_path, file_size, file_mtime in files:
+            if file_path.endswith('.part') or file_path in busy_paths:
+                continue
+            if current_time - file_mtime > self.MAX_CACHE_AGE:
+                try:
+                    os.unlink(file_path)
+                    removed.append(file_path)
+                    logger.info(f"Removed old cache file: {file_path}")
+                    continue
+                except Exception as e:
+                    logger.error(
+                        f"Error removing old cache file {file_path}: {e}"
+                    )
+            remaining.append((file_mtime, file_size, file_path))
+            total_size += file_size
+
+        # Check total size
+        if total_size > self.MAX_CACHE_SIZE:
+            # Evict untracked files oldest first, then tracked ones least
+            # recently used first
+            tracked = set(lru_paths)
+            sizes = {path: size for _, size, path in remaining}
+            eviction_order = [
+                path for _, _, path in sorted(remaining) if path not in tracked
+            ]
+            eviction_order += [path for path in lru_paths if path in sizes]
+            for file_path in eviction_order:
+                if total_size <= self.MAX_CACHE_SIZE:
+                    break
+                try:
+                    os.unlink(file_path)
+                    total_size -= sizes[file_path]
+                    removed.append(file_path)
+                    logger.info(f"Removed oversized cache file: {file_path}")
+                except Exception as e:
+                    logger.error(
+                        f"Error removing oversized cache file {file_path}: {e}"
+                    )
+
+        return removed
@@ -2,18 +2,30 @@
 Spotify integration module for handling Spotify notifications and album art.
 """
 
-import json
 import logging
+import os
+import threading
 import time
-from pathlib import Path
 from typing import Dict, Any, Optional
 
-from pydbus import SessionBus
+from gi.repository import GLib
 
-from eww_notifier.config import SPOTIFY_CACHE_DIR, SPOTIFY_ALBUM_ART_DIR, SPOTIFY_CACHE_MAX_SIZE, SPOTIFY_CACHE_MAX_AGE
+from eww_notifier.config import (
+    SPOTIFY_CACHE_DIR,
+    SPOTIFY_ALBUM_ART_DIR,
+    ALBUM_ART_URL_SCHEMES
+)
+from eww_notifier.utils.file_utils import read_json_file, write_json_file
 
 logger = logging.getLogger(__name__)
 
+# Delay (in milliseconds) used to coalesce bursts of metadata updates into one write
+METADATA_SAVE_DELAY_MS = 1000
+
+# Seconds before the first background cache sweep and between later sweeps
+CACHE_CLEANUP_DELAY = 5.0
+CACHE_CLEANUP_INTERVAL = 30 * 60
+
 
 class SpotifyHandler:
     """Handler for Spotify-specific notification features and album art caching."""
@@ -24,8 +36,11 @@ class SpotifyHandler:
         self.album_art_dir = SPOTIFY_ALBUM_ART_DIR
         self._ensure_directories()
         self.metadata_cache = self._load_metadata_cache()
+        self._save_scheduled = False
         self.album_art_handler = album_art_handler
-        self._cleanup_cache()
+        # Cache sweeps run off the main thread so they never delay startup or notifications
+        self._cleanup_lock = threading.Lock()
+        self._schedule_cleanup(CACHE_CLEANUP_DELAY)
 
     def _ensure_directories(self):
         """Ensure cache directories exist."""
@@ -36,8 +51,7 @@ class SpotifyHandler:
         """Load metadata cache from file."""
         try:
             if self.metadata_cache_file.exists():
-                with open(self.metadata_cache_file, 'r') as f:
-                    return json.load(f)
+                return read_json_file(self.metadata_cache_file)
         except Exception as e:
             logger.error(f"Error loading Spotify metadata cache: {e}")
         return {}
@@ -45,12 +59,27 @@ class SpotifyHandler:
     def _save_metadata_cache(self) -> None:
         """Save metadata cache to file."""
         try:
-            with open(self.metadata_cache_file, 'w') as f:
-                json.dump(self.metadata_cache, f, indent=2)
+            write_json_file(self.metadata_cache_file, self.metadata_cache)
             logger.info(f"Saved {len(self.metadata_cache)} metadata entries to cache")
         except Exception as e:
             logger.error(f"Error saving metadata cache: {e}")
 
+    def _flush_metadata_cache(self) -> bool:
+        """Write a pending metadata update to disk.
+
+        Returns:
+            False so GLib does not reschedule the timeout
+        """
+        self._save_scheduled = False
+        self._save_metadata_cache()
+        return False
+
+    def flush(self) -> None:
+        """Write any pending metadata and album art cache updates to disk immediately."""
+        if self._save_scheduled:
+            self._flush_metadata_cache()
+        self.album_art_handler.flush()
+
     def update_metadata(self, notification_id: str, metadata: Dict[str, Any]) -> None:
         """Update metadata for a notification."""
         try:
@@ -58,7 +87,9 @@ class SpotifyHandler:
                 **metadata,
                 'timestamp': time.time()
             }
-            self._save_metadata_cache()
+            if not self._save_scheduled:
+                GLib.timeout_add(METADATA_SAVE_DELAY_MS, self._flush_metadata_cache)
+                self._save_scheduled = True
         except Exception as e:
             logger.error(f"Error updating metadata: {e}")
 
@@ -70,27 +101,17 @@ class SpotifyHandler:
         """Get album art path.
         
         Args:
-            url_or_data: Either a URL string or a source identifier ('mpris' or 'hint')
+            url_or_data: Either a URL string or the 'hint' source identifier
             
         Returns:
             Optional[str]: Path to the album art file if successful, None otherwise
         """
         try:
             # If url_or_data is a URL string, use it directly
-            if isinstance(url_or_data, str) and url_or_data.startswith('https://'):
+            if isinstance(url_or_data, str) and url_or_data.startswith(ALBUM_ART_URL_SCHEMES):
                 logger.info(f"Using provided album art URL: {url_or_data}")
                 return self.album_art_handler.get_album_art_path(url_or_data)
 
-            # If url_or_data is 'mpris', get URL from MPRIS
-            if url_or_data == 'mpris':
-                bus = SessionBus()
-                spotify = bus.get("org.mpris.MediaPlayer2.spotify", "/org/mpris/MediaPlayer2")
-                metadata = spotify.Metadata
-                url = metadata.get("mpris:artUrl", "")
-                if url.startswith("https://"):
-                    logger.info(f"Got album art URL from MPRIS: {url}")
-                    return self.album_art_handler.get_album_art_path(url)
-
             # If url_or_data is 'hint', we should have received a URL
             if url_or_data == 'hint':
                 logger.warning("Expected URL for 'hint' source but none provided")
@@ -100,59 +121,57 @@ class SpotifyHandler:
             logger.error(f"Error getting album art path: {e}")
             return None
 
+    def _schedule_cleanup(self, delay: float) -> None:
+        """Schedule a background cache sweep.
+
+        Args:
+            delay: Seconds to wait before the sweep
+        """
+        timer = threading.Timer(delay, self._run_scheduled_cleanup)
+        timer.daemon = True
+        timer.start()
+
+    def _run_scheduled_cleanup(self) -> None:
+        """Run a cache sweep and schedule the next one."""
+        try:
+            self._cleanup_cache()
+        finally:
+            self._schedule_cleanup(CACHE_CLEANUP_INTERVAL)
+
     def _cleanup_cache(self) -> None:
-        """Clean up old and oversized cache entries."""
+        """Clean up old and oversized cache entries.
+
+        Album art files are evicted by the album art handler, which shares the
+        cache directory. Metadata pointing at evicted files is pruned on the
+        main loop, where the metadata cache is otherwise updated.
+        """
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self.album_art_handler.cleanup_cache()
+            GLib.idle_add(self._prune_metadata_cache)
+        except Exception as e:
+            logger.error(f"Error cleaning up cache: {e}")
+        finally:
+            self._cleanup_lock.release()
+
+    def _prune_metadata_cache(self) -> bool:
+        """Remove metadata entries whose album art no longer exists.
+
+        Returns:
+            False so GLib does not reschedule the callback
+        """
         try:
-            current_time = time.time()
-            total_size = 0
-            files_to_remove = []
-
-            # Check each file in the album art directory
-            for file_path in self.album_art_dir.glob("*"):
-                if file_path.is_file():
-                    # Check file age
-                    file_age = current_time - file_path.stat().st_mtime
-                    if file_age > SPOTIFY_CACHE_MAX_AGE:
-                        files_to_remove.append(file_path)
-                        continue
-
-                    # Add to total size
-                    total_size += file_path.stat().st_size
-
-            # Remove old files
-            for file_path in files_to_remove:
-                try:
-                    file_path.unlink()
-                    logger.info(f"Removed old cache file: {file_path}")
-                except Exception as e:
-                    logger.error(f"Error removing old cache file {file_path}: {e}")
-
-            # If still oversize limit, remove the oldest files
-            if total_size > SPOTIFY_CACHE_MAX_SIZE:
-                files_by_age = sorted(
-                    self.album_art_dir.glob("*"),
-                    key=lambda x: x.stat().st_mtime
-                )
-                for file_path in files_by_age:
-                    if total_size <= SPOTIFY_CACHE_MAX_SIZE:
-                        break
-                    try:
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        total_size -= file_size
-                        logger.info(f"Removed oversized cache file: {file_path}")
-                    except Exception as e:
-                        logger.error(f"Error removing oversized cache file {file_path}: {e}")
-
-            # Clean up metadata cache - remove entries pointing to non-existent files
             current_metadata = {}
-            for url_hash, metadata in list(self.metadata_cache.items()):  # Iterate over a copy
-                if 'album_art_path' in metadata and Path(metadata['album_art_path']).exists():
+            for url_hash, metadata in self.metadata_cache.items():
+                album_art_path = metadata.get('album_art_path')
+                if album_art_path and os.path.exists(album_art_path):
                     current_metadata[url_hash] = metadata
                 else:
                     logger.info(f"Removing metadata for non-existent album art: {url_hash}")
-            self.metadata_cache = current_metadata
-            self._save_metadata_cache()
-
+            if len(current_metadata) != len(self.metadata_cache):
+                self.metadata_cache = current_metadata
+                self._save_metadata_cache()
         except Exception as e:
-            logger.error(f"Error cleaning up cache: {e}")
+            logger.error(f"Error pruning metadata cache: {e}")
+        return False
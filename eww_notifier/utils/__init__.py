@@ -4,8 +4,15 @@ Utility functions package.
 
 import logging
 
-from eww_notifier.utils.file_utils import get_file_size_mb
-from eww_notifier.utils.icon_utils import get_theme_icon, get_desktop_icon, find_icon_path
+from eww_notifier.utils.dbus_utils import get_session_bus
+from eww_notifier.utils.file_utils import (
+    get_file_size_mb,
+    scan_directory_files,
+    dumps_json,
+    read_json_file,
+    write_json_file,
+)
+from eww_notifier.utils.icon_utils import get_theme_icon, get_desktop_icon, find_icon_path, clear_icon_caches
 
 logger = logging.getLogger(__name__)
 
@@ -13,5 +20,11 @@ __all__ = [
     'get_theme_icon',
     'get_desktop_icon',
     'find_icon_path',
-    'get_file_size_mb'
+    'clear_icon_caches',
+    'get_session_bus',
+    'get_file_size_mb',
+    'scan_directory_files',
+    'dumps_json',
+    'read_json_file',
+    'write_json_file'
 ]
@@ -0,0 +1,23 @@
+"""
+D-Bus utility functions.
+"""
+
+try:
+    from pydbus import SessionBus
+except ImportError:
+    SessionBus = None  # type: ignore[assignment,misc]
+
+# Session bus connection shared by all handlers, opened on first use
+_session_bus = None
+
+
+def get_session_bus():
+    """Return the shared pydbus session bus, connecting on first call.
+
+    Returns:
+        The session bus, or None if pydbus is not installed
+    """
+    global _session_bus
+    if _session_bus is None and SessionBus is not None:
+        _session_bus = SessionBus()
+    return _session_bus
@@ -2,6 +2,7 @@
 Error handling utilities for the notification system.
 """
 
+import functools
 import logging
 import sys
 import time
@@ -65,30 +66,28 @@ def retry_on_error(
         Decorated function that will retry on specified exceptions
     """
 
+    # Sleep before each retry, computed once instead of on every call
+    delays = tuple(delay * backoff ** attempt for attempt in range(max_retries - 1))
+
     def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            current_delay = delay
-            last_exception = None
-
-            for attempt in range(max_retries):
+            for attempt, current_delay in enumerate(delays, 1):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}. "
-                            f"Retrying in {current_delay:.1f}s..."
-                        )
-                        time.sleep(current_delay)
-                        current_delay *= backoff
-                    else:
-                        logger.error(
-                            f"All {max_retries} attempts failed. Last error: {str(e)}"
-                        )
-                        raise last_exception
-
-            raise last_exception
+                    logger.warning(
+                        f"Attempt {attempt}/{max_retries} failed: {str(e)}. "
+                        f"Retrying in {current_delay:.1f}s..."
+                    )
+                    time.sleep(current_delay)
+
+            # Final attempt propagates its exception
+            try:
+                return func(*args, **kwargs)
+            except exceptions as e:
+                logger.error(f"All {max_retries} attempts failed. Last error: {str(e)}")
+                raise
 
         return wrapper
 
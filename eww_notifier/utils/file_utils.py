@@ -2,7 +2,15 @@
 File system utility functions.
 """
 
+import json
+import os
 from pathlib import Path
+from typing import Any, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 def get_file_size_mb(path: Path) -> float:
@@ -17,6 +25,78 @@ def get_file_size_mb(path: Path) -> float:
     return path.stat().st_size / (1024 * 1024)
 
 
+def scan_directory_files(
+        directory: Union[str, Path]
+) -> List[Tuple[str, int, float]]:
+    """List regular files in a directory with their size and modification time.
+
+    Uses a single os.scandir pass and one stat per entry.
+
+    Args:
+        directory: Directory to scan (not recursive)
+
+    Returns:
+        List of (path, size_in_bytes, mtime) tuples
+    """
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+    return files
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: JSON-serializable data
+
+    Returns:
+        bytes: UTF-8 encoded JSON without indentation
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson rejects some subclasses, e.g. of float, that D-Bus hint
+            # values use
+            pass
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def read_json_file(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Any: Parsed JSON data
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json_file(path: Union[str, Path], data: Any) -> None:
+    """Atomically write data to a file as compact JSON.
+
+    The data is written to a sibling temporary file which then replaces the
+    target, so a crash mid-write never leaves a truncated file behind.
+
+    Args:
+        path: Path to the JSON file
+        data: JSON-serializable data
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(dumps_json(data))
+    os.replace(tmp_path, path)
+
+
 def create_directories():
     """Create necessary directories with proper error handling."""
     from eww_notifier.config import SPOTIFY_CACHE_DIR, SPOTIFY_ALBUM_ART_DIR
@@ -2,51 +2,182 @@
 Icon utility functions.
 """
 
+import functools
 import logging
 import os
-from pathlib import Path
-from typing import Optional
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
 
 from eww_notifier.config import DESKTOP_DIRS, DEFAULT_ICON
 from eww_notifier.icon_config import ICON_DIRS, ICON_SIZES, ICON_EXTENSIONS, APP_ICONS
 
 logger = logging.getLogger(__name__)
 
+# Subdirectories of each size directory searched for theme icons, in
+# priority order
+THEME_SUBDIRS = (
+    "apps", "actions", "devices", "places", "status", "mimetypes", "categories"
+)
+
+# Priority of each icon extension, lower is preferred
+_EXTENSION_RANK = {ext: rank for rank, ext in enumerate(ICON_EXTENSIONS)}
+
+# Theme icon index, built on first lookup and dropped by clear_icon_caches()
+_icon_index: Optional[Dict[str, str]] = None
+
+# ICON_DIRS entries that exist, checked once and dropped by clear_icon_caches()
+_valid_icon_dirs: Optional[Tuple[str, ...]] = None
+
+# Icon names known to resolve to the default icon, oldest first
+MAX_MISSING_ICONS = 1024
+_missing_icons: Set[str] = set()
+_missing_order: Deque[str] = deque()
+
+
+def _get_valid_icon_dirs() -> Tuple[str, ...]:
+    """Get the ICON_DIRS entries that exist, checked on first use."""
+    global _valid_icon_dirs
+    if _valid_icon_dirs is None:
+        _valid_icon_dirs = tuple(
+            base_dir for base_dir in ICON_DIRS if os.path.isdir(base_dir)
+        )
+    return _valid_icon_dirs
+
+
+def _index_directory(index: Dict[str, str], directory: str) -> None:
+    """Add the icons in one directory to the index.
+
+    Names already in the index are kept, so directories must be indexed in
+    priority order. Within a directory, ICON_EXTENSIONS order decides.
+
+    Args:
+        index: Icon name to path mapping, updated in place
+        directory: Directory to list
+    """
+    found: Dict[str, Tuple[int, str]] = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                rank = _EXTENSION_RANK.get(ext)
+                if rank is None or name in index:
+                    continue
+                if name in found and found[name][0] <= rank:
+                    continue
+                if entry.is_file():
+                    found[name] = (rank, entry.path)
+    except OSError:
+        return
+    for name, (_, path) in found.items():
+        index[name] = path
+
+
+def _build_icon_index() -> Dict[str, str]:
+    """Build the icon name to path index for all existing theme directories."""
+    index: Dict[str, str] = {}
+    for base_dir in _get_valid_icon_dirs():
+        for size in ICON_SIZES:
+            # One listing per size directory tells which category
+            # subdirectories exist
+            size_dir = os.path.join(base_dir, size)
+            try:
+                with os.scandir(size_dir) as entries:
+                    subdirs = {e.name for e in entries if e.is_dir()}
+            except OSError:
+                continue
+            for subdir in THEME_SUBDIRS:
+                if subdir in subdirs:
+                    _index_directory(index, os.path.join(size_dir, subdir))
+        _index_directory(index, base_dir)
+    logger.debug("Indexed %d theme icons", len(index))
+    return index
+
+
+def _search_icon_tree(icon_dir: str, icon_name: str) -> Optional[str]:
+    """Search a directory tree for an icon file.
+
+    Walks the tree with os.scandir, using the directory entry type instead
+    of a stat() per entry. Within one directory, ICON_EXTENSIONS order decides.
+
+    Args:
+        icon_dir: Root directory to search
+        icon_name: Name of the icon to find
+
+    Returns:
+        Optional[str]: Path to the icon if found, None otherwise
+    """
+    candidates = {
+        f"{icon_name}{ext}": rank for rank, ext in enumerate(ICON_EXTENSIONS)
+    }
+    stack = [icon_dir]
+    while stack:
+        best: Optional[Tuple[int, str]] = None
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    rank = candidates.get(entry.name)
+                    if rank is not None and (best is None or rank < best[0]):
+                        best = (rank, entry.path)
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+        if best is not None:
+            return best[1]
+    return None
+
 
 def get_theme_icon(icon_name: str) -> Optional[str]:
     """Get the path to a theme icon.
     
+    Lookups are served from an in-memory index built on first use. Icons
+    installed afterwards are picked up once clear_icon_caches() runs, which
+    the daemon does on SIGHUP.
+
     Args:
         icon_name: Name of the icon to find
         
     Returns:
         Optional[str]: Path to the icon if found, None otherwise
     """
-    for base_dir in ICON_DIRS:
-        base_path = Path(base_dir)
+    global _icon_index
+    if _icon_index is None:
+        _icon_index = _build_icon_index()
+    return _icon_index.get(icon_name)
 
-        for size in ICON_SIZES:
-            for subdir in ["apps", "actions", "devices", "places", "status", "mimetypes", "categories"]:
-                search_path = base_path / size / subdir
-                if not search_path.is_dir():
-                    continue
 
-                for ext in ICON_EXTENSIONS:
-                    icon_file = search_path / f"{icon_name}{ext}"
-                    if icon_file.is_file():
-                        return str(icon_file)
+def _read_desktop_icon_name(data: bytes) -> Optional[str]:
+    """Extract the Icon key of the [Desktop Entry] group from a desktop file.
 
-        for ext in ICON_EXTENSIONS:
-            flat_icon = base_path / f"{icon_name}{ext}"
-            if flat_icon.is_file():
-                return str(flat_icon)
+    Args:
+        data: Raw desktop file contents
 
-    return None
+    Returns:
+        Optional[str]: Icon name or path if present, None otherwise
+    """
+    # Limit the search to the main group; action groups carry their own
+    # Icon keys
+    start = data.find(b'[Desktop Entry]')
+    section = b'\n' + data[max(start, 0):]
+    end = section.find(b'\n[', 2)
+    if end >= 0:
+        section = section[:end]
 
+    i = section.find(b'\nIcon=')
+    if i < 0:
+        return None
+    i += 6
+    j = section.find(b'\n', i)
+    icon_name = section[i:j if j >= 0 else None].decode('utf-8', 'replace')
+    return icon_name.strip() or None
 
+
+@functools.lru_cache(maxsize=256)
 def get_desktop_icon(app_id: str) -> Optional[str]:
     """Get the icon path from a desktop file.
     
+    Results are memoized per application ID.
+
     Args:
         app_id: The application ID to find the desktop file for
         
@@ -57,19 +188,29 @@ def get_desktop_icon(app_id: str) -> Optional[str]:
         for path in DESKTOP_DIRS:
             desktop_file = path / f"{app_id}.desktop"
             if desktop_file.exists():
-                with open(desktop_file, 'r') as f:
-                    for line in f:
-                        if line.startswith('Icon='):
-                            icon_name = line.strip().split('=', 1)[1]
-                            return find_icon_path(icon_name, True)
+                icon_name = _read_desktop_icon_name(desktop_file.read_bytes())
+                if icon_name:
+                    return find_icon_path(icon_name, True)
     except Exception as e:
         logger.debug(f"Failed to get desktop icon for {app_id}: {e}")
     return None
 
 
+def _remember_missing_icon(icon_name: str) -> None:
+    """Remember an icon name that resolved to the default icon."""
+    if len(_missing_order) >= MAX_MISSING_ICONS:
+        _missing_icons.discard(_missing_order.popleft())
+    _missing_icons.add(icon_name)
+    _missing_order.append(icon_name)
+
+
+@functools.lru_cache(maxsize=1024)
 def find_icon_path(icon_name: str, is_recursive: bool = False) -> str:
     """Find the path to an icon file.
     
+    Results are memoized, so each icon name is only resolved against the
+    filesystem once per process.
+
     Args:
         icon_name: Name of the icon to find
         is_recursive: Whether this is a recursive call (to avoid infinite recursion)
@@ -78,6 +219,9 @@ def find_icon_path(icon_name: str, is_recursive: bool = False) -> str:
         str: Path to the icon file
     """
     try:
+        if not is_recursive and icon_name in _missing_icons:
+            return find_icon_path(APP_ICONS['default'], True)
+
         if os.path.isabs(icon_name) and os.path.exists(icon_name):
             return icon_name
 
@@ -90,10 +234,7 @@ def find_icon_path(icon_name: str, is_recursive: bool = False) -> str:
             if desktop_icon:
                 return desktop_icon
 
-        for icon_dir in ICON_DIRS:
-            if not os.path.exists(icon_dir):
-                continue
-
+        for icon_dir in _get_valid_icon_dirs():
             for ext in ICON_EXTENSIONS:
                 file_path = os.path.join(icon_dir, icon_name + ext)
                 if os.path.exists(file_path):
@@ -111,13 +252,13 @@ def find_icon_path(icon_name: str, is_recursive: bool = False) -> str:
                     if os.path.exists(path):
                         return path
 
-            for root, _, files in os.walk(icon_dir):
-                for ext in ICON_EXTENSIONS:
-                    if f"{icon_name}{ext}" in files:
-                        return os.path.join(root, f"{icon_name}{ext}")
+            found = _search_icon_tree(icon_dir, icon_name)
+            if found:
+                return found
 
         if not is_recursive and icon_name != APP_ICONS['default']:
             logger.warning(f"Icon not found: {icon_name}, using default")
+            _remember_missing_icon(icon_name)
             return find_icon_path(APP_ICONS['default'], True)
 
         return str(DEFAULT_ICON)
@@ -125,3 +266,15 @@ def find_icon_path(icon_name: str, is_recursive: bool = False) -> str:
     except Exception as e:
         logger.error(f"Error finding icon path for {icon_name}: {e}")
         return str(DEFAULT_ICON)
+
+
+def clear_icon_caches() -> None:
+    """Drop all memoized icon lookups so theme changes are picked up."""
+    global _icon_index, _valid_icon_dirs
+    find_icon_path.cache_clear()
+    get_desktop_icon.cache_clear()
+    _icon_index = None
+    _valid_icon_dirs = None
+    _missing_icons.clear()
+    _missing_order.clear()
+    logger.info("Icon caches cleared")
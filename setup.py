@@ -22,42 +22,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from setuptools import setup, find_packages
+# Package metadata lives in pyproject.toml; this shim keeps legacy
+# `python setup.py ...` invocations working.
+from setuptools import setup
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
-
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = fh.read().splitlines()
-
-setup(
-    name="eww-notifier",
-    version="0.1.0",
-    author="KhalidWKhedr",
-    author_email="khalidwaleedkhedr@gmail.com",
-    description="A custom DBus notification service for Linux desktops",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/KhalidWKhedr/eww-notifier",
-    packages=find_packages(),
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: End Users/Desktop",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: POSIX :: Linux",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Topic :: Desktop Environment",
-        "Topic :: System :: Monitoring",
-    ],
-    python_requires=">=3.8",
-    install_requires=requirements,
-    entry_points={
-        "console_scripts": [
-            "eww-notifier=eww_notifier.__main__:main",
-        ],
-    },
-)
+setup()
@@ -0,0 +1,155 @@
+import io
+import os
+
+from eww_notifier.spotify.album_art_handler import AlbumArtHandler
+
+
+def make_handler(tmp_path, monkeypatch):
+    # Patch cache paths to use temp dirs
+    monkeypatch.setattr('eww_notifier.spotify.album_art_handler.SPOTIFY_CACHE_DIR', tmp_path)
+    monkeypatch.setattr('eww_notifier.spotify.album_art_handler.SPOTIFY_ALBUM_ART_DIR', tmp_path / 'album_art')
+    return AlbumArtHandler()
+
+
+def test_url_cache_persists(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path, monkeypatch)
+    art_file = tmp_path / 'album_art' / 'art.jpg'
+    art_file.write_bytes(b'data')
+    handler._store_cache_entry('https://example.com/art.jpg', str(art_file))
+
+    reloaded = make_handler(tmp_path, monkeypatch)
+    assert reloaded.album_art_cache == {'https://example.com/art.jpg': str(art_file)}
+    assert reloaded.get_album_art_path('https://example.com/art.jpg') == str(art_file)
+
+
+def test_cleanup_cache_removes_entries(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path, monkeypatch)
+    art_file = tmp_path / 'album_art' / 'art.jpg'
+    art_file.write_bytes(b'data')
+    handler._store_cache_entry('https://example.com/art.jpg', str(art_file))
+    handler.MAX_CACHE_AGE = -1
+    handler.cleanup_cache()
+
+    assert not art_file.exists()
+    assert make_handler(tmp_path, monkeypatch).album_art_cache == {}
+
+
+def test_legacy_json_cache_migrated(tmp_path, monkeypatch):
+    import hashlib
+    import json
+    url = 'https://example.com/art.jpg'
+    (tmp_path / 'album_art').mkdir()
+    legacy_file = tmp_path / 'album_art' / f"{hashlib.md5(url.encode()).hexdigest()}.jpg"
+    legacy_file.write_bytes(b'data')
+    (tmp_path / 'url_cache.json').write_text(json.dumps({url: str(legacy_file)}))
+
+    reloaded = make_handler(tmp_path, monkeypatch)
+    new_path = tmp_path / 'album_art' / f"{AlbumArtHandler._url_hash(url)}.jpg"
+    assert not (tmp_path / 'url_cache.json').exists()
+    assert not legacy_file.exists()
+    assert new_path.read_bytes() == b'data'
+    assert reloaded.album_art_cache == {url: str(new_path)}
+    assert make_handler(tmp_path, monkeypatch).album_art_cache == {url: str(new_path)}
+
+
+def test_concurrent_downloads_coalesced(tmp_path, monkeypatch):
+    import threading
+    from unittest.mock import MagicMock
+
+    handler = make_handler(tmp_path, monkeypatch)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_get(url, timeout, stream):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.raw = io.BytesIO(b'image')
+        return response
+
+    handler._session = MagicMock(get=slow_get)
+    url = 'https://example.com/cover.jpg'
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(handler.get_album_art_path(url))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1 and results[0].endswith('.jpg')
+
+
+def test_cleanup_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path, monkeypatch)
+    paths = {}
+    for name in ('a', 'b', 'c'):
+        art_file = tmp_path / 'album_art' / f'{name}.jpg'
+        art_file.write_bytes(b'x' * 10)
+        paths[name] = str(art_file)
+        handler._store_cache_entry(f'https://example.com/{name}.jpg', str(art_file))
+    # 'a' was downloaded first but used most recently
+    assert handler.get_album_art_path('https://example.com/a.jpg') == paths['a']
+    handler.MAX_CACHE_SIZE = 20
+    handler.cleanup_cache()
+
+    assert os.path.exists(paths['a'])
+    assert not os.path.exists(paths['b'])
+    assert list(make_handler(tmp_path, monkeypatch).album_art_cache) == [
+        'https://example.com/c.jpg', 'https://example.com/a.jpg'
+    ]
+
+
+def test_failed_download_leaves_no_file(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock
+
+    handler = make_handler(tmp_path, monkeypatch)
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.raw.read.side_effect = OSError('connection reset')
+    handler._session = MagicMock(get=MagicMock(return_value=response))
+
+    assert handler.get_album_art_path('https://example.com/broken.jpg') is None
+    assert os.listdir(tmp_path / 'album_art') == []
+    assert handler.album_art_cache == {}
+
+
+def test_cache_hit_recency_written_on_flush(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path, monkeypatch)
+    url = 'https://example.com/art.jpg'
+    art_file = tmp_path / 'album_art' / 'art.jpg'
+    art_file.write_bytes(b'data')
+    handler._store_cache_entry(url, str(art_file))
+    query = "SELECT last_used FROM art WHERE url = ?"
+    stored = handler._db.execute(query, (url,)).fetchone()[0]
+
+    # A cache hit only updates the in-memory order
+    assert handler.get_album_art_path(url) == str(art_file)
+    assert handler._db.execute(query, (url,)).fetchone()[0] == stored
+    handler.flush()
+    assert handler._db.execute(query, (url,)).fetchone()[0] > stored
+
+
+def test_cleanup_cache_skips_downloads_in_progress(tmp_path, monkeypatch):
+    import threading
+
+    handler = make_handler(tmp_path, monkeypatch)
+    url = 'https://example.com/cover.jpg'
+    final_file = handler.ALBUM_ART_DIR / f"{AlbumArtHandler._url_hash(url)}.jpg"
+    part_file = final_file.with_name(final_file.name + '.part')
+    stale_file = tmp_path / 'album_art' / 'stale.jpg'
+    for art_file in (final_file, part_file, stale_file):
+        art_file.write_bytes(b'x' * 10)
+    handler._inflight[url] = threading.Event()
+    handler.MAX_CACHE_AGE = -1
+    handler.MAX_CACHE_SIZE = 0
+    handler.cleanup_cache()
+
+    assert final_file.exists()
+    assert part_file.exists()
+    assert not stale_file.exists()
@@ -1,9 +1,19 @@
-from eww_notifier.utils.file_utils import get_file_size_mb, create_directories
+import os
+
+from eww_notifier.utils.file_utils import (
+    get_file_size_mb,
+    create_directories,
+    dumps_json,
+    scan_directory_files,
+    read_json_file,
+    write_json_file,
+)
 
 
 def test_get_file_size_mb(tmp_path):
     file = tmp_path / 'test.txt'
-    file.write_text('a' * 1024 * 1024)  # 1 MB
+    file.touch()
+    os.truncate(file, 1024 * 1024)  # 1 MB sparse file
     size = get_file_size_mb(file)
     assert 0.99 < size < 1.01
 
@@ -15,3 +25,28 @@ def test_create_directories(monkeypatch, tmp_path):
     create_directories()
     assert (tmp_path / 'spotify_cache').exists()
     assert (tmp_path / 'spotify_cache' / 'album_art').exists()
+
+
+def test_scan_directory_files(tmp_path):
+    (tmp_path / 'art.jpg').write_bytes(b'abc')
+    (tmp_path / 'subdir').mkdir()
+    files = scan_directory_files(tmp_path)
+    assert len(files) == 1
+    path, size, mtime = files[0]
+    assert path == str(tmp_path / 'art.jpg')
+    assert size == 3
+    assert mtime > 0
+
+
+def test_json_file_round_trip(tmp_path):
+    path = tmp_path / 'data.json'
+    write_json_file(path, {'a': [1, 'b']})
+    assert b' ' not in path.read_bytes()
+    assert read_json_file(path) == {'a': [1, 'b']}
+
+
+def test_dumps_json_float_subclass():
+    class Double(float):
+        pass
+
+    assert dumps_json([Double(1.5)]) == b'[1.5]'
@@ -1,13 +1,36 @@
-from unittest.mock import patch
+import pytest
 
 from eww_notifier.utils import icon_utils
 
 
-def test_get_theme_icon_found(monkeypatch):
-    with patch('pathlib.Path.is_dir', return_value=True), \
-            patch('pathlib.Path.is_file', return_value=True):
-        result = icon_utils.get_theme_icon('testicon')
-        assert isinstance(result, str)
+@pytest.fixture(autouse=True)
+def fresh_icon_caches():
+    # Every test builds the theme index from its own ICON_DIRS
+    icon_utils.clear_icon_caches()
+    yield
+    icon_utils.clear_icon_caches()
+
+
+def test_get_theme_icon_found(tmp_path, monkeypatch):
+    apps_dir = tmp_path / '48' / 'apps'
+    apps_dir.mkdir(parents=True)
+    (apps_dir / 'testicon.png').write_text('data')
+    (apps_dir / 'testicon.svg').write_text('data')
+    monkeypatch.setattr(icon_utils, 'ICON_DIRS', [str(tmp_path)])
+    result = icon_utils.get_theme_icon('testicon')
+    assert result == str(apps_dir / 'testicon.svg')
+
+
+def test_get_theme_icon_index_refreshed(tmp_path, monkeypatch):
+    monkeypatch.setattr(icon_utils, 'ICON_DIRS', [str(tmp_path)])
+    apps_dir = tmp_path / '48' / 'apps'
+    apps_dir.mkdir(parents=True)
+    assert icon_utils.get_theme_icon('newicon') is None
+    (apps_dir / 'newicon.svg').write_text('data')
+    # The index is kept until the caches are cleared, as on SIGHUP
+    assert icon_utils.get_theme_icon('newicon') is None
+    icon_utils.clear_icon_caches()
+    assert icon_utils.get_theme_icon('newicon') == str(apps_dir / 'newicon.svg')
 
 
 def test_get_theme_icon_not_found():
@@ -23,9 +46,72 @@ def test_find_icon_path_absolute(tmp_path):
 
 
 def test_find_icon_path_default(monkeypatch):
-    # Simulate all lookups failing, should return DEFAULT_ICON
+    # Simulate all lookups failing against an empty icon search path, should return DEFAULT_ICON
     monkeypatch.setattr(icon_utils, 'get_theme_icon', lambda x: None)
     monkeypatch.setattr(icon_utils, 'get_desktop_icon', lambda x, y=False: None)
-    with patch('os.path.exists', return_value=False):
-        result = icon_utils.find_icon_path('nonexistenticon')
-        assert result.endswith('.svg')
+    monkeypatch.setattr(icon_utils, '_valid_icon_dirs', ())
+    result = icon_utils.find_icon_path('nonexistenticon')
+    assert result.endswith('.svg')
+
+
+def test_find_icon_path_memoized(tmp_path):
+    icon_file = tmp_path / 'cached.svg'
+    icon_file.write_text('data')
+    assert icon_utils.find_icon_path(str(icon_file)) == str(icon_file)
+    icon_file.unlink()
+    # Second lookup is served from the cache without touching the filesystem
+    assert icon_utils.find_icon_path(str(icon_file)) == str(icon_file)
+
+
+def test_search_icon_tree(tmp_path):
+    nested = tmp_path / 'theme' / 'extra' / 'deep'
+    nested.mkdir(parents=True)
+    (nested / 'deepicon.png').write_text('data')
+    (nested / 'deepicon.svg').write_text('data')
+    assert icon_utils._search_icon_tree(str(tmp_path), 'deepicon') == str(nested / 'deepicon.svg')
+    assert icon_utils._search_icon_tree(str(tmp_path), 'missing') is None
+
+
+def test_get_desktop_icon_memoized(tmp_path, monkeypatch):
+    monkeypatch.setattr(icon_utils, 'DESKTOP_DIRS', [tmp_path])
+    icon_file = tmp_path / 'app.svg'
+    icon_file.write_text('data')
+    desktop_file = tmp_path / 'org.test.App.desktop'
+    desktop_file.write_text(f"[Desktop Entry]\nName=App\nIcon={icon_file}\n")
+    assert icon_utils.get_desktop_icon('org.test.App') == str(icon_file)
+    desktop_file.unlink()
+    assert icon_utils.get_desktop_icon('org.test.App') == str(icon_file)
+    icon_utils.clear_icon_caches()
+    assert icon_utils.get_desktop_icon('org.test.App') is None
+
+
+def test_read_desktop_icon_name():
+    data = b"[Desktop Entry]\nName=App\nIcon=app-icon\n\n[Desktop Action new]\nIcon=action-icon\n"
+    assert icon_utils._read_desktop_icon_name(data) == 'app-icon'
+    assert icon_utils._read_desktop_icon_name(b"Icon=bare\r\n") == 'bare'
+    assert icon_utils._read_desktop_icon_name(b"[Desktop Entry]\nName=App\n[Desktop Action x]\nIcon=y\n") is None
+
+
+def test_missing_icon_remembered(monkeypatch):
+    monkeypatch.setattr(icon_utils, 'ICON_DIRS', [])
+    monkeypatch.setattr(icon_utils, 'MAX_MISSING_ICONS', 2)
+    default = icon_utils.find_icon_path('missing-a')
+    icon_utils.find_icon_path('missing-b')
+    icon_utils.find_icon_path('missing-c')
+    assert icon_utils._missing_icons == {'missing-b', 'missing-c'}
+
+    # Known misses skip the search even when the memo table is cleared
+    icon_utils.find_icon_path.cache_clear()
+    monkeypatch.setattr(icon_utils, 'get_theme_icon', lambda x: 'unexpected' if x == 'missing-b' else None)
+    assert icon_utils.find_icon_path('missing-b') == default
+
+
+def test_valid_icon_dirs_checked_once(tmp_path, monkeypatch):
+    missing = tmp_path / 'missing'
+    monkeypatch.setattr(icon_utils, 'ICON_DIRS', [str(tmp_path), str(missing)])
+    assert icon_utils._get_valid_icon_dirs() == (str(tmp_path),)
+    missing.mkdir()
+    icon_utils.get_theme_icon('anything')
+    assert icon_utils._get_valid_icon_dirs() == (str(tmp_path),)
+    icon_utils.clear_icon_caches()
+    assert icon_utils._get_valid_icon_dirs() == (str(tmp_path), str(missing))
@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eww_notifier.notifier.notification_handler import NotificationHandler, BATCH_FLUSH_INTERVAL_MS
+
+
+@pytest.fixture
+def handler():
+    queue = MagicMock()
+    queue.get_notifications.return_value = []
+    queue.get_notification.return_value = None
+    return NotificationHandler(queue, MagicMock(), MagicMock(), MagicMock(), MagicMock(), {})
+
+
+def make_notification(notification_id):
+    return {'notification_id': notification_id, 'summary': f'Notification {notification_id}'}
+
+
+def test_notifications_flushed_in_one_batch(handler):
+    with patch('eww_notifier.notifier.notification_handler.GLib.timeout_add') as mock_timeout:
+        handler.process_notification(make_notification('1'))
+        handler.process_notification(make_notification('2'))
+    # Both notifications share one scheduled flush
+    mock_timeout.assert_called_once_with(BATCH_FLUSH_INTERVAL_MS, handler._flush_batch)
+    handler.notification_queue.add_notifications.assert_not_called()
+
+    assert handler._flush_batch() is False
+    handler.notification_queue.add_notifications.assert_called_once_with(
+        [make_notification('1'), make_notification('2')]
+    )
+    assert handler._pending_batch == []
+
+
+def test_close_pending_notification(handler):
+    with patch('eww_notifier.notifier.notification_handler.GLib.timeout_add'):
+        handler.process_notification(make_notification('1'))
+        handler.process_notification(make_notification('2'))
+    assert handler.get_notification('1') == make_notification('1')
+    assert [n['notification_id'] for n in handler.get_notifications()] == ['2', '1']
+
+    handler.close_notification(1)
+    assert handler.get_notification('1') is None
+    handler._flush_batch()
+    handler.notification_queue.add_notifications.assert_called_once_with([make_notification('2')])
+
+
+def test_shutdown_flushes_pending_batch(handler):
+    with patch('eww_notifier.notifier.notification_handler.GLib.timeout_add'):
+        handler.process_notification(make_notification('1'))
+    handler.shutdown()
+    handler.notification_queue.add_notifications.assert_called_once_with([make_notification('1')])
+    handler.spotify_handler.flush.assert_called_once()
@@ -22,107 +22,173 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from unittest.mock import MagicMock
+from types import MappingProxyType
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from eww_notifier.config import SPOTIFY_MPRIS_BUS_NAME
 from eww_notifier.notifier.notification_processor import NotificationProcessor
 
+# Read-only base payload; tests override only the fields they exercise
+NOTIFICATION_TEMPLATE = MappingProxyType({
+    "app_name": "test_app",
+    "replaces_id": 0,
+    "app_icon": "test_icon",
+    "summary": "Test Summary",
+    "body": "Test Body",
+    "actions": [],
+    "hints": {},
+    "expire_timeout": 5000
+})
 
-def test_notification_processor_initialization():
-    """Test that NotificationProcessor initializes correctly."""
-    mock_logger = MagicMock()
-    mock_spotify_handler = MagicMock()
-    processor = NotificationProcessor(mock_logger, mock_spotify_handler)
-    assert processor is not None
 
+@pytest.fixture(scope="module")
+def mock_dependencies():
+    """Logger and Spotify handler mocks shared by every test in this module."""
+    return MagicMock(), MagicMock()
 
-def test_process_notification():
-    """Test basic notification processing."""
-    mock_logger = MagicMock()
-    mock_spotify_handler = MagicMock()
-    processor = NotificationProcessor(mock_logger, mock_spotify_handler)
-    notification = {
-        "app_name": "test_app",
-        "replaces_id": 0,
-        "app_icon": "test_icon",
-        "summary": "Test Summary",
-        "body": "Test Body",
-        "actions": [],
-        "hints": {},
-        "expire_timeout": 5000
-    }
 
-    result = processor.process_notification_data(**notification)
-    assert result is not None
-    assert "app" in result
-    assert "summary" in result
-    assert "body" in result
-
-
-def test_process_spotify_notification():
-    """Test Spotify notification processing."""
-    mock_logger = MagicMock()
-    mock_spotify_handler = MagicMock()
-    processor = NotificationProcessor(mock_logger, mock_spotify_handler)
-    notification = {
-        "app_name": "Spotify",
-        "replaces_id": 0,
-        "app_icon": "spotify",
-        "summary": "Now Playing",
-        "body": "Test Song - Test Artist",
-        "actions": [],
-        "hints": {},
-        "expire_timeout": 5000
-    }
+@pytest.fixture
+def processor(mock_dependencies):
+    """Fresh processor per test, with the shared mocks reset so no state leaks between tests."""
+    for mock in mock_dependencies:
+        mock.reset_mock(return_value=True, side_effect=True)
+    return NotificationProcessor(*mock_dependencies)
 
-    result = processor.process_notification_data(**notification)
-    assert result is not None
-    assert result["app"] == "Spotify"
-    assert "image" in result
-
-
-def test_process_notification_with_actions():
-    """Test notification processing with actions."""
-    mock_logger = MagicMock()
-    mock_spotify_handler = MagicMock()
-    processor = NotificationProcessor(mock_logger, mock_spotify_handler)
-    notification = {
-        "app_name": "test_app",
-        "replaces_id": 0,
-        "app_icon": "test_icon",
-        "summary": "Test Summary",
-        "body": "Test Body",
-        "actions": ["action1", "Action 1", "action2", "Action 2"],
-        "hints": {},
-        "expire_timeout": 5000
-    }
 
-    result = processor.process_notification_data(**notification)
-    assert result is not None
-    assert "actions" in result
-    assert len(result["actions"]) == 2
-
-
-def test_process_notification_with_hints():
-    """Test notification processing with hints."""
-    mock_logger = MagicMock()
-    mock_spotify_handler = MagicMock()
-    processor = NotificationProcessor(mock_logger, mock_spotify_handler)
-    notification = {
-        "app_name": "test_app",
-        "replaces_id": 0,
-        "app_icon": "test_icon",
-        "summary": "Test Summary",
-        "body": "Test Body",
-        "actions": [],
-        "hints": {
-            "urgency": 1,
-            "category": "test.category"
-        },
-        "expire_timeout": 5000
-    }
+def test_notification_processor_initialization(processor):
+    """Test that NotificationProcessor initializes correctly."""
+    assert processor is not None
+
 
+@pytest.mark.parametrize("notification, check", [
+    pytest.param(
+        NOTIFICATION_TEMPLATE,
+        lambda result: "app" in result and "summary" in result and "body" in result,
+        id="basic",
+    ),
+    pytest.param(
+        {**NOTIFICATION_TEMPLATE, "app_name": "Spotify", "app_icon": "spotify", "summary": "Now Playing",
+         "body": "Test Song - Test Artist"},
+        lambda result: result["app"] == "Spotify" and "image" in result,
+        id="spotify",
+    ),
+    pytest.param(
+        {**NOTIFICATION_TEMPLATE, "actions": ["action1", "Action 1", "action2", "Action 2"]},
+        lambda result: "actions" in result and len(result["actions"]) == 2,
+        id="actions",
+    ),
+    pytest.param(
+        {**NOTIFICATION_TEMPLATE, "hints": {"urgency": 1, "category": "test.category"}},
+        lambda result: "urgency" in result and "hints" in result and "category" in result["hints"],
+        id="hints",
+    ),
+])
+def test_process_notification(processor, notification, check):
+    """Test notification processing for basic, Spotify, action and hint payloads."""
     result = processor.process_notification_data(**notification)
     assert result is not None
-    assert "urgency" in result
-    assert "hints" in result
-    assert "category" in result["hints"]
+    assert check(result)
+
+
+def test_generate_notification_id_wraps(processor):
+    """Test that notification IDs are sequential and wrap within D-Bus range."""
+    assert processor.generate_notification_id() == 1
+    assert processor.generate_notification_id() == 2
+
+    processor.notification_id_counter = 0xFFFFFFFF
+    assert processor.generate_notification_id() == 0xFFFFFFFF
+    assert processor.generate_notification_id() == 1
+
+
+def test_spotify_metadata_proxy_cached(processor, monkeypatch):
+    """Test that the MPRIS proxy is created once and metadata is read from cache."""
+    mock_spotify_handler = processor.spotify_handler
+    mock_spotify_handler.get_album_art_path.return_value = '/tmp/art.png'
+    monkeypatch.setattr('eww_notifier.utils.dbus_utils._session_bus', None)
+    with patch('eww_notifier.utils.dbus_utils.SessionBus') as MockBus:
+        mock_spotify = MagicMock()
+        mock_spotify.Metadata = {'mpris:artUrl': 'https://example.com/art.png'}
+        MockBus.return_value.get.return_value = mock_spotify
+        for notification_id in ('1', '2'):
+            notification = {'notification_id': notification_id, 'summary': 'Now Playing', 'body': 'Song',
+                            'image': None}
+            processor.handle_spotify_notification(notification, {})
+
+    assert notification['image'] == '/tmp/art.png'
+    assert MockBus.return_value.get.call_count == 1
+    mock_spotify_handler.get_album_art_path.assert_called_with('https://example.com/art.png')
+
+
+def test_spotify_subscription_dropped_on_restart(processor, monkeypatch):
+    """Test that the PropertiesChanged subscription is disconnected when Spotify quits."""
+    monkeypatch.setattr('eww_notifier.utils.dbus_utils._session_bus', None)
+    with patch('eww_notifier.utils.dbus_utils.SessionBus') as MockBus:
+        mock_spotify = MockBus.return_value.get.return_value
+        mock_spotify.Metadata = {}
+        assert processor._ensure_spotify_proxy()
+        subscription = mock_spotify.PropertiesChanged.connect.return_value
+
+        processor._on_name_owner_changed(SPOTIFY_MPRIS_BUS_NAME, ':1.42', '')
+        subscription.disconnect.assert_called_once()
+        assert processor._spotify_proxy is None
+
+        # Reconnecting subscribes once more, not on top of the old subscription
+        assert processor._ensure_spotify_proxy()
+        assert mock_spotify.PropertiesChanged.connect.call_count == 2
+        subscription.disconnect.assert_called_once()
+
+
+def test_spotify_album_art_hint_priority(processor):
+    """Test that image-path takes priority over other album art hints."""
+    mock_spotify_handler = processor.spotify_handler
+    mock_spotify_handler.get_album_art_path.return_value = '/tmp/art.png'
+    notification = {'notification_id': '1', 'summary': 'Now Playing', 'body': 'Song', 'image': None}
+    hints = {'image': 'https://example.com/other.png', 'image-path': 'https://example.com/art.png'}
+
+    processor.handle_spotify_notification(notification, hints)
+    mock_spotify_handler.get_album_art_path.assert_called_once_with('https://example.com/art.png')
+    assert notification['image'] == '/tmp/art.png'
+
+
+def test_repeat_notification_reuses_icon(processor):
+    """Test that a repeat notification skips the icon lookup but gets a new ID."""
+    first = processor.process_notification_data(**NOTIFICATION_TEMPLATE)
+    with patch('eww_notifier.notifier.notification_processor.find_icon_path') as mock_find_icon:
+        second = processor.process_notification_data(**NOTIFICATION_TEMPLATE)
+        mock_find_icon.assert_not_called()
+
+    assert second is not first
+    assert second['notification_id'] != first['notification_id']
+    assert second['icon'] == first['icon']
+
+
+def test_repeat_notification_uses_its_own_fields(processor):
+    """Test that a same-text notification keeps its own urgency, actions and hints."""
+    first = processor.process_notification_data(**NOTIFICATION_TEMPLATE)
+    second = processor.process_notification_data(**{
+        **NOTIFICATION_TEMPLATE,
+        "actions": ["open", "Open"],
+        "hints": {"urgency": 2, "category": "im"},
+    })
+
+    assert first['urgency'] == 'normal' and first['actions'] == []
+    assert second['urgency'] == 'critical'
+    assert second['actions'] == [{'notification_id': 'open', 'label': 'Open'}]
+    assert second['hints']['category'] == 'im'
+    assert second['actions'] is not first['actions']
+    assert second['hints'] is not first['hints']
+
+
+def test_repeat_spotify_notification_updates_metadata(processor):
+    """Test that every Spotify notification, even a repeat, reaches the Spotify handler."""
+    spotify = {**NOTIFICATION_TEMPLATE, "app_name": "Spotify", "hints": {"image-path": "https://example.com/art.png"}}
+    processor.spotify_handler.get_album_art_path.return_value = '/tmp/art.png'
+    first = processor.process_notification_data(**spotify)
+    second = processor.process_notification_data(**spotify)
+
+    assert first['image'] == second['image'] == '/tmp/art.png'
+    assert [c.args[0] for c in processor.spotify_handler.update_metadata.call_args_list] == [
+        first['notification_id'], second['notification_id']
+    ]
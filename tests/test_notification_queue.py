@@ -1,24 +1,37 @@
 import os
+import subprocess
 import tempfile
 import time
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from eww_notifier.notification_queue.notification_queue import NotificationQueue
+from eww_notifier.notification_queue.notification_queue import NotificationQueue, WIDGET_REFRESH_INTERVAL
 
 
-@pytest.fixture
-def temp_notification_file(monkeypatch):
+@pytest.fixture(scope="module")
+def temp_notification_file():
+    # One cache file for the whole module; the queue module imports the paths by name
     with tempfile.NamedTemporaryFile(delete=False) as f:
         temp_path = f.name
-    monkeypatch.setattr('eww_notifier.config.NOTIFICATION_FILE', temp_path)
-    monkeypatch.setattr('eww_notifier.config.NOTIFICATION_TEMP_FILE', temp_path + '.tmp')
-    yield temp_path
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('eww_notifier.notification_queue.notification_queue.NOTIFICATION_FILE', Path(temp_path))
+        mp.setattr('eww_notifier.notification_queue.notification_queue.NOTIFICATION_TEMP_FILE',
+                   Path(temp_path + '.tmp'))
+        yield temp_path
     os.remove(temp_path)
     if os.path.exists(temp_path + '.tmp'):
         os.remove(temp_path + '.tmp')
 
 
+@pytest.fixture(autouse=True)
+def reset_notification_file(temp_notification_file):
+    # Start every test from an empty cache file
+    with open(temp_notification_file, 'w') as f:
+        f.write('[]')
+
+
 def test_queue_initialization(temp_notification_file):
     queue = NotificationQueue()
     assert isinstance(queue.notifications, list)
@@ -57,3 +70,48 @@ def test_expired_notification_cleanup(temp_notification_file):
     queue.add_notification(old_notif)
     queue._cleanup_old_notifications()
     assert not any(n['notification_id'] == '4' for n in queue.notifications)
+
+
+def test_add_notifications_batch(temp_notification_file):
+    queue = NotificationQueue()
+    batch = [
+        {'notification_id': '5', 'summary': 'First', 'body': 'Body', 'expire_timeout': 10000,
+         'timestamp': time.time()},
+        {'notification_id': '6', 'summary': 'Second', 'body': 'Body', 'expire_timeout': 10000,
+         'timestamp': time.time()},
+    ]
+    queue.add_notifications(batch)
+    assert [n['notification_id'] for n in queue.notifications[:2]] == ['6', '5']
+
+
+def test_unchanged_widget_update_skipped(temp_notification_file):
+    queue = NotificationQueue()
+    queue.notifications = [{'notification_id': '7', 'summary': 'Same', 'body': 'Body', 'expire_timeout': 10000,
+                            'timestamp': time.time()}]
+    with patch.object(queue, 'should_update', return_value=True), \
+            patch('eww_notifier.notification_queue.notification_queue.subprocess.run') as mock_run:
+        queue.update_eww_widget()
+        queue.update_eww_widget()
+        assert mock_run.call_count == 1
+        queue.notifications = []
+        queue.update_eww_widget()
+        assert mock_run.call_count == 2
+
+
+def test_unchanged_widget_update_retried(temp_notification_file):
+    queue = NotificationQueue()
+    queue.notifications = [{'notification_id': '8', 'summary': 'Same', 'body': 'Body', 'expire_timeout': 10000,
+                            'timestamp': time.time()}]
+    with patch.object(queue, 'should_update', return_value=True), \
+            patch('eww_notifier.notification_queue.notification_queue.subprocess.run') as mock_run:
+        # A failed push is retried even though the payload has not changed
+        mock_run.side_effect = subprocess.CalledProcessError(1, 'eww')
+        queue.update_eww_widget()
+        mock_run.side_effect = None
+        queue.update_eww_widget()
+        assert mock_run.call_count == 2
+
+        # An unchanged payload is pushed again once the refresh interval has passed
+        queue._last_widget_push -= WIDGET_REFRESH_INTERVAL
+        queue.update_eww_widget()
+        assert mock_run.call_count == 3
@@ -2,17 +2,32 @@ import os
 import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from eww_notifier.spotify.album_art_handler import AlbumArtHandler
 from eww_notifier.spotify.spotify_handler import SpotifyHandler
 
 
+@pytest.fixture(autouse=True)
+def no_cleanup_timer():
+    # Keep the background cache sweep from starting real timer threads
+    with patch('eww_notifier.spotify.spotify_handler.threading.Timer') as mock_timer:
+        yield mock_timer
+
+
 def test_metadata_cache(tmp_path):
     album_art_handler = MagicMock(spec=AlbumArtHandler)
     handler = SpotifyHandler(album_art_handler)
     handler.metadata_cache_file = tmp_path / "metadata.json"
     handler.metadata_cache = {}
-    handler.update_metadata('notif1', {'foo': 'bar'})
+    with patch('eww_notifier.spotify.spotify_handler.GLib.timeout_add') as mock_timeout:
+        handler.update_metadata('notif1', {'foo': 'bar'})
+        handler.update_metadata('notif2', {'foo': 'baz'})
     assert 'notif1' in handler.metadata_cache
+    # Both updates share one scheduled write
+    assert mock_timeout.call_count == 1
+    handler.flush()
+    assert set(handler._load_metadata_cache()) == {'notif1', 'notif2'}
     loaded = handler._load_metadata_cache()
     assert isinstance(loaded, dict)
 
@@ -25,28 +40,31 @@ def test_get_album_art_path_url():
     assert result == '/tmp/art.png'
 
 
-def test_get_album_art_path_mpris(monkeypatch):
-    album_art_handler = MagicMock(spec=AlbumArtHandler)
-    album_art_handler.get_album_art_path.return_value = '/tmp/art.png'
-    handler = SpotifyHandler(album_art_handler)
-    with patch('pydbus.SessionBus') as MockBus:
-        mock_spotify = MagicMock()
-        mock_spotify.Metadata = {'mpris:artUrl': 'https://example.com/art.png'}
-        MockBus.return_value.get.return_value = mock_spotify
-        result = handler.get_album_art_path('mpris')
-        assert result == '/tmp/art.png'
-
-
 def test_cleanup_cache(tmp_path, monkeypatch):
-    album_art_handler = MagicMock(spec=AlbumArtHandler)
+    monkeypatch.setattr('eww_notifier.spotify.album_art_handler.SPOTIFY_CACHE_DIR', tmp_path)
+    monkeypatch.setattr('eww_notifier.spotify.album_art_handler.SPOTIFY_ALBUM_ART_DIR', tmp_path)
+    album_art_handler = AlbumArtHandler()
+    # Cache max age of 1 second
+    album_art_handler.MAX_CACHE_AGE = 1
     handler = SpotifyHandler(album_art_handler)
-    handler.album_art_dir = tmp_path
-    # Patch cache max age to 1 second
-    monkeypatch.setattr('eww_notifier.spotify.spotify_handler.SPOTIFY_CACHE_MAX_AGE', 1)
+    handler.metadata_cache_file = tmp_path / "metadata.json"
     # Create a fake old file
     old_file = tmp_path / 'old.png'
     old_file.write_text('data')
     os.utime(old_file, (time.time() - 100000, time.time() - 100000))
-    handler._cleanup_cache()
+    handler.metadata_cache = {'notif1': {'album_art_path': str(old_file)}}
+    with patch('eww_notifier.spotify.spotify_handler.GLib.idle_add') as mock_idle:
+        handler._cleanup_cache()
     # File should be removed if too old
     assert not old_file.exists()
+    # Metadata pointing at it is pruned on the main loop
+    mock_idle.assert_called_once_with(handler._prune_metadata_cache)
+    handler._prune_metadata_cache()
+    assert handler.metadata_cache == {}
+
+
+def test_cleanup_scheduled_in_background(no_cleanup_timer):
+    album_art_handler = MagicMock(spec=AlbumArtHandler)
+    SpotifyHandler(album_art_handler)
+    no_cleanup_timer.return_value.start.assert_called_once()
+    album_art_handler.cleanup_cache.assert_not_called()